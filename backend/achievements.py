@@ -0,0 +1,227 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from power_ups import POWER_UPS_BY_ID
+
+logger = logging.getLogger(__name__)
+
+# Achievement catalog shared by the REST API and the evaluator
+ACHIEVEMENTS = [
+    {
+        "id": "mind_reader",
+        "name": "Mind Reader",
+        "description": "Predict 10 #1 answers in a row",
+        "icon": "🧠",
+        "rarity": "rare",
+        "points": 100
+    },
+    {
+        "id": "friendship_destroyer",
+        "name": "Friendship Destroyer",
+        "description": "Cause 10 arguments in friend group",
+        "icon": "💀",
+        "rarity": "epic",
+        "points": 200
+    },
+    {
+        "id": "meme_lord",
+        "name": "Meme Lord",
+        "description": "Create 25 viral moments",
+        "icon": "👑",
+        "rarity": "legendary",
+        "points": 500
+    },
+    {
+        "id": "clutch_player",
+        "name": "Clutch Player",
+        "description": "Win 5 games in final round",
+        "icon": "🔥",
+        "rarity": "rare",
+        "points": 150
+    }
+]
+
+ACHIEVEMENTS_BY_ID = {achievement['id']: achievement for achievement in ACHIEVEMENTS}
+
+# Counter value at which each achievement unlocks
+MIND_READER_STREAK = 10
+FRIENDSHIP_DESTROYER_STEALS = 10
+MEME_LORD_MOMENTS = 25
+CLUTCH_PLAYER_WINS = 5
+
+# Connections whose progress is kept; the least recently active are dropped beyond this
+MAX_TRACKED_PLAYERS = 100_000
+# Unlocks buffered before they are appended to the store
+UNLOCK_BATCH_SIZE = 50
+# Seconds an unlock may wait in the buffer before it is written
+UNLOCK_FLUSH_SECONDS = 5.0
+
+
+class Progress:
+    """Running counters for one connected player; each rule reads and updates one field"""
+
+    __slots__ = ('top_streak', 'steals', 'viral_moments', 'clutch_wins', 'unlocked')
+
+    def __init__(self):
+        self.top_streak = 0
+        self.steals = 0
+        self.viral_moments = 0
+        self.clutch_wins = 0
+        self.unlocked = set()
+
+
+class UnlockStore:
+    """Append-only JSONL log of unlocks, written in batches.
+
+    The log is a record only: display names are not an identity, so it is
+    never read back to grant unlocks. Without a path nothing is written.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._pending: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict) -> None:
+        with self._lock:
+            first = not self._pending
+            self._pending.append(record)
+            full = len(self._pending) >= UNLOCK_BATCH_SIZE
+        if full:
+            self.flush()
+        elif first and self.path:
+            # Bound how long a partial batch waits
+            timer = threading.Timer(UNLOCK_FLUSH_SECONDS, self.flush)
+            timer.daemon = True
+            timer.start()
+
+    def flush(self) -> int:
+        """Write buffered unlocks and return how many were written"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch or not self.path:
+            return len(batch)
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in batch))
+        except OSError as e:
+            logger.error(f"Failed to persist {len(batch)} achievement unlocks: {e}")
+            with self._lock:
+                self._pending[:0] = batch
+            return 0
+        return len(batch)
+
+
+class AchievementEngine:
+    """Evaluates achievements incrementally from game events.
+
+    GameManager reports rounds, steals, cards and game ends as they happen;
+    each report touches only the players involved and updates a counter per
+    rule, so no history is ever scanned. Unlocks are queued per room for the
+    socket layer to announce and handed to the store in batches.
+
+    Progress is keyed by socket id, not display name: names are neither
+    unique within a room nor owned by anyone, so name-keyed progress let
+    players with the same name share one streak and take over each other's
+    unlocks. Progress therefore lasts as long as the connection.
+
+    Rules: a streak of top answers for Mind Reader, successful steals for
+    Friendship Destroyer, chaos cards played for Meme Lord, and games won by
+    overtaking the leader in the final round for Clutch Player.
+    """
+
+    def __init__(self, store: Optional[UnlockStore] = None, clock=time.time):
+        self.store = store or UnlockStore()
+        self.clock = clock
+        self._progress: 'OrderedDict[str, Progress]' = OrderedDict()
+        self._pending: Dict[str, List[Dict]] = {}
+        self.unlocks = 0
+
+    def round_resolved(self, room, top_options: List[int]) -> None:
+        """Extend or reset each player's streak of #1 answers"""
+        survey = bool((room.current_question or {}).get('answers'))
+        # A tie for most popular means there was no #1 answer to predict
+        top_option = top_options[0] if len(top_options) == 1 else None
+        for player in room.players:
+            if survey:
+                hit = bool(player.last_match) and player.last_match.get('rank') == 1
+            else:
+                hit = top_option is not None and player.answer_index == top_option
+            progress = self._get(player.sid)
+            progress.top_streak = progress.top_streak + 1 if hit else 0
+            if progress.top_streak >= MIND_READER_STREAK:
+                self._unlock(room, player, progress, 'mind_reader')
+
+    def steal(self, room, thief) -> None:
+        progress = self._get(thief.sid)
+        progress.steals += 1
+        if progress.steals >= FRIENDSHIP_DESTROYER_STEALS:
+            self._unlock(room, thief, progress, 'friendship_destroyer')
+
+    def card_played(self, room, player, card_id: str) -> None:
+        if POWER_UPS_BY_ID.get(card_id, {}).get('type') != 'chaos':
+            return
+        progress = self._get(player.sid)
+        progress.viral_moments += 1
+        if progress.viral_moments >= MEME_LORD_MOMENTS:
+            self._unlock(room, player, progress, 'meme_lord')
+
+    def game_ended(self, room) -> None:
+        """Credit a clutch win when the final round changed who was in front"""
+        if len(room.players) < 2:
+            return
+        winner = max(room.players, key=lambda p: p.score)
+        # Scores before the final round; covers survey points, popularity points and steals
+        before = {p.sid: p.round_start_score for p in room.players}
+        if any(p.score == winner.score for p in room.players if p is not winner):
+            return
+        if all(before[winner.sid] > score for sid, score in before.items() if sid != winner.sid):
+            return
+        progress = self._get(winner.sid)
+        progress.clutch_wins += 1
+        if progress.clutch_wins >= CLUTCH_PLAYER_WINS:
+            self._unlock(room, winner, progress, 'clutch_player')
+
+    def pop_unlocks(self, room_code: str) -> List[Dict]:
+        """Unlocks earned in a room since the last call"""
+        return self._pending.pop(room_code, [])
+
+    def flush(self) -> int:
+        return self.store.flush()
+
+    def forget(self, sid: str) -> None:
+        """Drop a disconnected player's progress"""
+        self._progress.pop(sid, None)
+
+    def _get(self, sid: str) -> Progress:
+        progress = self._progress.get(sid)
+        if progress is None:
+            progress = self._progress[sid] = Progress()
+            if len(self._progress) > MAX_TRACKED_PLAYERS:
+                self._progress.popitem(last=False)
+        else:
+            self._progress.move_to_end(sid)
+        return progress
+
+    def _unlock(self, room, player, progress: Progress, achievement_id: str) -> None:
+        if achievement_id in progress.unlocked:
+            return
+        progress.unlocked.add(achievement_id)
+        self.unlocks += 1
+        achievement = ACHIEVEMENTS_BY_ID[achievement_id]
+        self._pending.setdefault(room.room_code, []).append({
+            'player_sid': player.sid,
+            'player_name': player.name,
+            'achievement': achievement
+        })
+        self.store.add({
+            'player_sid': player.sid,
+            'player_name': player.name,
+            'achievement': achievement_id,
+            'room_code': room.room_code,
+            'unlocked_at': self.clock()
+        })
@@ -0,0 +1,154 @@
+import re
+from typing import Dict, List, Optional, Set
+
+# Words that carry no meaning when comparing survey answers
+STOPWORDS = {
+    'a', 'an', 'the', 'to', 'of', 'and', 'or', 'in', 'on', 'it', 'its', "it's",
+    'is', 'be', 'being', 'their', 'your', 'my', 'they', 'that', 'this', 'for', 'with'
+}
+
+# Common ways players phrase the same idea; both sides are normalized before lookup
+SYNONYMS = {
+    'mic': 'microphone',
+    'mike': 'microphone',
+    'sound': 'noise',
+    'sounds': 'noise',
+    'chewing': 'eating',
+    'munching': 'eating',
+    'loud': 'loudly',
+    'typing': 'keyboard',
+    'keys': 'keyboard',
+    'price': 'cost',
+    'money': 'cost',
+    'crypto': 'cryptocurrency',
+}
+
+_WORD_RE = re.compile(r"[a-z0-9#']+")
+
+# Minimum similarity for a fuzzy guess to count as a match
+MATCH_THRESHOLD = 0.55
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase, tokenize, drop stopwords, map synonyms and strip plural 's'"""
+    tokens = []
+    for word in _WORD_RE.findall(text.lower()):
+        word = word.strip("'")
+        if not word or word in STOPWORDS:
+            continue
+        word = SYNONYMS.get(word, word)
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance, giving up early once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(cost)
+            row_min = min(row_min, cost)
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class AnswerMatcher:
+    """Precomputed index over one question's answer board"""
+
+    def __init__(self, answers: List[Dict]):
+        self.answers = answers
+        self._exact: Dict[str, int] = {}
+        self._token_sets: List[Set[str]] = []
+        self._trigram_sets: List[Set[str]] = []
+        self._trigram_index: Dict[str, Set[int]] = {}
+        self._token_index: Dict[str, Set[int]] = {}
+
+        for idx, answer in enumerate(answers):
+            variants = [answer['text']] + list(answer.get('synonyms', []))
+            tokens: Set[str] = set()
+            trigrams: Set[str] = set()
+            for variant in variants:
+                variant_tokens = normalize_tokens(variant)
+                key = ' '.join(variant_tokens)
+                self._exact.setdefault(key, idx)
+                tokens.update(variant_tokens)
+                trigrams |= _trigrams(key)
+            self._token_sets.append(tokens)
+            self._trigram_sets.append(trigrams)
+            for gram in trigrams:
+                self._trigram_index.setdefault(gram, set()).add(idx)
+            for token in tokens:
+                self._token_index.setdefault(token, set()).add(idx)
+
+    def match(self, guess: str) -> Optional[Dict]:
+        """Return the best matching answer for a free-text guess, or None"""
+        tokens = normalize_tokens(guess or '')
+        if not tokens:
+            return None
+        key = ' '.join(tokens)
+
+        idx = self._exact.get(key)
+        if idx is not None:
+            return self._result(idx, 1.0)
+
+        guess_trigrams = _trigrams(key)
+        candidates: Set[int] = set()
+        for token in tokens:
+            candidates |= self._token_index.get(token, set())
+        for gram in guess_trigrams:
+            candidates |= self._trigram_index.get(gram, set())
+
+        best_idx, best_score = None, 0.0
+        guess_tokens = set(tokens)
+        for idx in candidates:
+            answer_trigrams = self._trigram_sets[idx]
+            trigram_score = len(guess_trigrams & answer_trigrams) / len(guess_trigrams | answer_trigrams)
+            answer_tokens = self._token_sets[idx]
+            # Either side may carry extra words ("big dog" for "Dog", "dog" for "Hot dog")
+            shared = len(guess_tokens & answer_tokens)
+            token_score = max(shared / len(guess_tokens), shared / len(answer_tokens))
+            score = max(trigram_score, token_score * 0.9)
+            if score > best_score:
+                best_idx, best_score = idx, score
+
+        if best_score < MATCH_THRESHOLD:
+            # Fall back to typo tolerance on single-word guesses
+            if len(tokens) == 1 and len(key) > 3:
+                limit = 1 if len(key) <= 5 else 2
+                for word, indexes in self._token_index.items():
+                    if _edit_distance(key, word, limit) <= limit:
+                        return self._result(min(indexes), 0.8)
+            return None
+        return self._result(best_idx, round(best_score, 3))
+
+    def _result(self, idx: int, similarity: float) -> Dict:
+        answer = self.answers[idx]
+        return {
+            'text': answer['text'],
+            'rank': answer.get('rank', idx + 1),
+            'points': answer.get('points', 0),
+            'similarity': similarity
+        }
+
+
+def build_answer_matchers(questions: List[Dict]) -> Dict:
+    """Build an AnswerMatcher for every question that carries an answer board"""
+    return {
+        question['id']: AnswerMatcher(question['answers'])
+        for question in questions
+        if question.get('answers')
+    }
@@ -0,0 +1,54 @@
+"""Measure time from process launch to the first accepted connection.
+
+Usage: python backend/bench_startup.py [main|prefork] [runs]
+"""
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_connection(entrypoint: str, timeout: float = 30.0) -> float:
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=os.environ.get('WEB_CONCURRENCY', '2'))
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(BACKEND_DIR, f'{entrypoint}.py')],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=0.5) as conn:
+                    conn.sendall(b'GET /api/game/health HTTP/1.0\r\n\r\n')
+                    if conn.recv(16):
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f'{entrypoint} did not accept a connection within {timeout}s')
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait()
+
+
+if __name__ == '__main__':
+    entrypoint = sys.argv[1] if len(sys.argv) > 1 else 'main'
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    samples = [time_to_first_connection(entrypoint) * 1000 for _ in range(runs)]
+    print(f'{entrypoint}: time to first accepted connection '
+          f'median {statistics.median(samples):.1f} ms, min {min(samples):.1f} ms over {runs} runs')
@@ -0,0 +1,78 @@
+import gzip
+import json
+import sys
+import time
+from collections import deque
+from typing import Optional
+
+# Events kept per room; older events are overwritten
+CLIP_BUFFER_SIZE = 512
+# Longest free text stored with an event
+MAX_TEXT_LENGTH = 80
+
+
+class EventRing:
+    """Fixed-size ring buffer of a room's recent events.
+
+    Events are stored as (timestamp, kind, actor, data) tuples so per-room
+    memory is bounded by CLIP_BUFFER_SIZE regardless of game length.
+    """
+
+    __slots__ = ('_events', '_clock')
+
+    def __init__(self, size: int = CLIP_BUFFER_SIZE, clock=time.time):
+        self._events = deque(maxlen=size)
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def now(self) -> float:
+        """Current time on the clock events are stamped with"""
+        return self._clock()
+
+    def record(self, kind: str, actor: Optional[str] = None, data=None) -> None:
+        if isinstance(data, str):
+            data = data[:MAX_TEXT_LENGTH]
+        self._events.append((self._clock(), kind, actor, data))
+
+    def memory_size(self) -> int:
+        """Approximate bytes held by the ring and its events"""
+        size = sys.getsizeof(self) + sys.getsizeof(self._events)
+        for event in self._events:
+            size += sys.getsizeof(event) + sum(sys.getsizeof(field) for field in event)
+        return size
+
+    def since(self, start: float) -> list:
+        """Events newer than start, oldest first"""
+        # Walk back from the newest event so short clips stay cheap
+        recent = []
+        for event in reversed(self._events):
+            if event[0] < start:
+                break
+            recent.append(event)
+        recent.reverse()
+        return recent
+
+
+def export_clip(room_code: str, ring: EventRing, seconds: float) -> bytes:
+    """Gzipped JSON clip of the last `seconds` of a room's events.
+
+    Timestamps are relative to the start of the clip so it can be replayed
+    by scheduling each event at its offset. The window is measured on the
+    ring's own clock so it lines up with the event timestamps.
+    """
+    now = ring.now()
+    start = now - seconds
+    events = ring.since(start)
+    origin = events[0][0] if events else now
+    clip = {
+        'room_code': room_code,
+        'exported_at': now,
+        'duration': round(now - origin, 3),
+        'events': [
+            {'t': round(ts - origin, 3), 'type': kind, 'actor': actor, 'data': data}
+            for ts, kind, actor, data in events
+        ]
+    }
+    return gzip.compress(json.dumps(clip, separators=(',', ':')).encode('utf-8'))
@@ -0,0 +1,203 @@
+"""Ingest community content packs into a question bank file.
+
+Reads JSONL packs (one question per line), normalizes and validates each
+question, drops exact duplicates by hash and near-duplicates via MinHash
+with LSH banding, and writes a compact bank that the server loads with
+QUESTION_BANK=<path>.
+
+Usage: python backend/content_ingest.py pack1.jsonl pack2.jsonl -o questions.bank
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+from question_bank import write_question_bank
+
+MAX_QUESTION_LENGTH = 300
+MAX_OPTION_LENGTH = 120
+MIN_OPTIONS = 2
+MAX_OPTIONS = 12
+
+# MinHash signature size and LSH banding (bands * rows == NUM_PERM)
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+# Shingle-set Jaccard similarity at or above which two questions are near-duplicates
+NEAR_DUP_THRESHOLD = 0.7
+
+# Each "permutation" XORs the 64-bit shingle hash with a fixed random mask,
+# which is several times cheaper in Python than (a * h + b) mod p
+_rng = random.Random(1337)
+_PERMUTATION_MASKS = [_rng.getrandbits(64) for _ in range(NUM_PERM)]
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def _clean(text) -> str:
+    return _SPACE_RE.sub(' ', text).strip() if isinstance(text, str) else ''
+
+
+def normalize_question(raw: Dict) -> Tuple[Optional[Dict], Optional[str]]:
+    """Return (question, None) for a valid pack entry, or (None, error)"""
+    if not isinstance(raw, dict):
+        return None, 'not an object'
+    text = _clean(raw.get('question'))
+    if not text:
+        return None, 'missing question'
+    if len(text) > MAX_QUESTION_LENGTH:
+        return None, 'question too long'
+
+    question = {
+        'question': text,
+        'category': _clean(raw.get('category')) or 'Community'
+    }
+
+    if raw.get('answers') is not None:
+        answers = []
+        for rank, answer in enumerate(raw['answers'] if isinstance(raw['answers'], list) else [], 1):
+            answer_text = _clean(answer.get('text')) if isinstance(answer, dict) else ''
+            points = answer.get('points') if isinstance(answer, dict) else None
+            if not answer_text or not isinstance(points, int) or len(answer_text) > MAX_OPTION_LENGTH:
+                return None, 'invalid answer'
+            answers.append({'text': answer_text, 'points': points, 'rank': rank})
+        if not MIN_OPTIONS <= len(answers) <= MAX_OPTIONS:
+            return None, 'wrong number of answers'
+        answers.sort(key=lambda a: -a['points'])
+        for rank, answer in enumerate(answers, 1):
+            answer['rank'] = rank
+        question['type'] = 'family_feud'
+        question['answers'] = answers
+    else:
+        options = raw.get('options')
+        if not isinstance(options, list):
+            return None, 'missing options'
+        options = [_clean(option) for option in options]
+        if any(not option or len(option) > MAX_OPTION_LENGTH for option in options):
+            return None, 'invalid option'
+        if len(set(o.lower() for o in options)) != len(options):
+            return None, 'duplicate options'
+        if not MIN_OPTIONS <= len(options) <= MAX_OPTIONS:
+            return None, 'wrong number of options'
+        question['options'] = options
+
+    question['id'] = _clean(str(raw['id'])) if raw.get('id') is not None else None
+    return question, None
+
+
+def _tokens(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower().replace("'", ''))
+
+
+def content_hash(question: Dict) -> bytes:
+    """Hash of the normalized prompt, used for exact duplicate detection"""
+    return hashlib.blake2b(' '.join(_tokens(question['question'])).encode('utf-8'), digest_size=8).digest()
+
+
+def shingles(question: Dict) -> Set[int]:
+    """Word unigram and bigram shingles of the prompt, hashed to ints"""
+    words = _tokens(question['question'])
+    grams = words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+    return {
+        int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'little')
+        for g in grams
+    }
+
+
+def minhash(shingle_set: Set[int]) -> List[int]:
+    return [min([h ^ mask for h in shingle_set]) for mask in _PERMUTATION_MASKS]
+
+
+class NearDuplicateIndex:
+    """LSH index over MinHash signatures of accepted questions"""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple, List[int]] = {}
+        self._shingles: List[Set[int]] = []
+
+    def find_or_add(self, shingle_set: Set[int]) -> bool:
+        """Return True if a near-duplicate exists; otherwise index the set and return False"""
+        if not shingle_set:
+            return False
+        signature = minhash(shingle_set)
+        keys = [(band, tuple(signature[band * ROWS:(band + 1) * ROWS])) for band in range(BANDS)]
+
+        checked = set()
+        for key in keys:
+            for candidate in self._buckets.get(key, ()):
+                if candidate in checked:
+                    continue
+                checked.add(candidate)
+                other = self._shingles[candidate]
+                if len(shingle_set & other) / len(shingle_set | other) >= NEAR_DUP_THRESHOLD:
+                    return True
+
+        idx = len(self._shingles)
+        self._shingles.append(shingle_set)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(idx)
+        return False
+
+
+def ingest(paths: List[str], output: str) -> Dict:
+    """Stream packs into a bank file and return ingestion counts"""
+    stats = {'read': 0, 'invalid': 0, 'exact_duplicates': 0, 'near_duplicates': 0, 'written': 0}
+    errors: Dict[str, int] = {}
+    seen_hashes: Set[bytes] = set()
+    seen_ids: Set[str] = set()
+    near_index = NearDuplicateIndex()
+    accepted: List[Dict] = []
+
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                stats['read'] += 1
+                try:
+                    raw = json.loads(line)
+                except ValueError:
+                    raw = None
+                question, error = normalize_question(raw)
+                if error:
+                    stats['invalid'] += 1
+                    errors[error] = errors.get(error, 0) + 1
+                    continue
+
+                digest = content_hash(question)
+                if digest in seen_hashes:
+                    stats['exact_duplicates'] += 1
+                    continue
+                seen_hashes.add(digest)
+
+                if near_index.find_or_add(shingles(question)):
+                    stats['near_duplicates'] += 1
+                    continue
+
+                if not question['id'] or question['id'] in seen_ids:
+                    question['id'] = f'pack_{digest.hex()}'
+                seen_ids.add(question['id'])
+                accepted.append(question)
+
+    stats['written'] = write_question_bank(output, accepted)
+    stats['errors'] = errors
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Build a question bank from JSONL content packs')
+    parser.add_argument('packs', nargs='+', help='JSONL content pack files')
+    parser.add_argument('-o', '--output', required=True, help='bank file to write')
+    args = parser.parse_args(argv)
+
+    stats = ingest(args.packs, args.output)
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
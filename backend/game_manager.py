@@ -1,59 +1,114 @@
+import heapq
+import hmac
+import os
 import random
+import secrets
 import string
+import sys
+import threading
 import time
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from achievements import AchievementEngine, UnlockStore
+from answer_matcher import AnswerMatcher, build_answer_matchers
+from clips import MAX_TEXT_LENGTH
+from question_bank import QuestionBank
+from power_ups import STARTING_TOKENS, STEAL_POINTS, TOKENS_PER_ROUND, PowerUpEngine
+from room import Player, Room, default_settings, settings_size
+from room_directory import RoomDirectory
+from seen_questions import SeenQuestionStore
+
+# Default seat limit for a room
+MAX_PLAYERS = 10
+
+# Seat limit for large-room (live event) mode
+LARGE_ROOM_MAX_PLAYERS = int(os.environ.get('LARGE_ROOM_MAX_PLAYERS', 2000))
+
+# Most rooms one provisioning call may create
+MAX_PROVISION_BATCH = 500
+MAX_TOTAL_ROUNDS = 20
+# Answer matchers kept for bank questions; the least recently used are rebuilt on demand
+MAX_CACHED_MATCHERS = 2048
+# Seconds a provisioned room keeps its host token before it is swept
+PROVISIONED_ROOM_TTL = float(os.environ.get('PROVISIONED_ROOM_TTL', 24 * 3600))
+# Most round trip time credited to an answer; the RTT is client-influenced
+MAX_RTT_ALLOWANCE = 1.0
 
 class GameManager:
-    def __init__(self):
-        self.rooms: Dict[str, Dict] = {}
-        self.questions = self._load_questions()
+    """Room and game state engine.
+
+    Randomness and time come from the injected `rng` and `clock` so a seeded
+    run can be replayed exactly (see simulate.py); they default to a fresh
+    Random and the wall clock. `question_bank` and `unlock_store` default to
+    the QUESTION_BANK and ACHIEVEMENT_STORE settings; pass '' and an
+    in-memory UnlockStore() to run on the built-in questions with nothing
+    written to disk.
+    """
+    
+    def __init__(self, rng: Optional[random.Random] = None, clock=time.time,
+                 question_bank: Optional[str] = None, unlock_store: Optional[UnlockStore] = None):
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self.rooms: Dict[str, Room] = {}
+        bank_path = os.environ.get('QUESTION_BANK') if question_bank is None else question_bank
+        if bank_path:
+            # Large ingested banks are memory-mapped; their matchers are built on first use
+            self.questions = QuestionBank(bank_path)
+            self.answer_matchers: 'OrderedDict[str, AnswerMatcher]' = OrderedDict()
+        else:
+            self.questions = self._load_questions()
+            self.answer_matchers = OrderedDict(build_answer_matchers(self.questions))
+        # (id -> position, lowercased category -> positions), built on the first deck lookup
+        self._deck_index: Optional[Tuple[Dict[str, int], Dict[str, List[int]]]] = None
+        self.directory = RoomDirectory()
+        self.power_ups = PowerUpEngine(clock=clock)
+        self.seen_questions = SeenQuestionStore(rng=self.rng, clock=clock)
+        if unlock_store is None:
+            unlock_store = UnlockStore(os.environ.get('ACHIEVEMENT_STORE'))
+        self.achievements = AchievementEngine(unlock_store, clock=clock)
+        # Spectators are kept outside room data so they never ride along in player broadcasts
+        self.spectators: Dict[str, Dict[str, str]] = {}
+        # Min-heap of (round_ends_at, room_code, round) for the round timer
+        self._round_deadlines: List = []
+        # Provisioned rooms still holding a host token -> expiry time, oldest first
+        self._unclaimed: Dict[str, float] = {}
+        # Long-polling waiters per room code, signalled when that room mutates;
+        # the conditions share one lock and exist only while someone waits
+        self._waiters_lock = threading.Lock()
+        self._room_waiters: Dict[str, threading.Condition] = {}
+        self._waiter_counts: Dict[str, int] = {}
     
     def generate_room_code(self) -> str:
         """Generate a unique 6-character room code"""
         while True:
             # Generate random 6-character code
-            code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+            code = ''.join(self.rng.choices(string.ascii_uppercase + string.digits, k=6))
             # Ensure it's unique
             if code not in self.rooms:
                 return code
     
-    def create_room(self, host_name: str, host_sid: str) -> Dict:
+    def create_room(self, host_name: str, host_sid: str, public: bool = False,
+                    large_room: bool = False) -> Dict:
         """Create a new game room"""
         try:
+            self.sweep_unclaimed_rooms()
             room_code = self.generate_room_code()
             
-            room_data = {
-                'room_code': room_code,
-                'host_sid': host_sid,
-                'players': [
-                    {
-                        'name': host_name,
-                        'sid': host_sid,
-                        'is_host': True,
-                        'score': 0,
-                        'answered': False
-                    }
-                ],
-                'game_started': False,
-                'current_round': 0,
-                'total_rounds': 5,
-                'current_question': None,
-                'scores': {host_sid: 0},
-                'settings': {
-                    'chaos_cards': True,
-                    'roast_mode': True,
-                    'viral_clips': True,
-                    'trending_topics': True
-                },
-                'created_at': time.time()
-            }
+            room = Room(
+                room_code,
+                Player(host_name, host_sid, is_host=True),
+                max_players=LARGE_ROOM_MAX_PLAYERS if large_room else MAX_PLAYERS,
+                settings=default_settings(public, large_room),
+                clock=self.clock
+            )
             
-            self.rooms[room_code] = room_data
+            self.rooms[room_code] = room
+            self.directory.update(room)
             
             return {
                 'success': True,
                 'room_code': room_code,
-                'room_data': room_data
+                'room_data': room.to_wire()
             }
         except Exception as e:
             print(f"Error creating room: {e}")
@@ -62,8 +117,108 @@ class GameManager:
                 'error': str(e)
             }
     
-    def join_room(self, room_code: str, player_name: str, player_sid: str) -> Dict:
-        """Join an existing room"""
+    def provision_rooms(self, count: int, settings: Optional[Dict] = None,
+                        total_rounds: Optional[int] = None, deck: Optional[Dict] = None,
+                        public: bool = False, large_room: bool = False) -> Dict:
+        """Create empty rooms in bulk, each claimed later by a player holding its host token"""
+        try:
+            if not 1 <= count <= MAX_PROVISION_BATCH:
+                return {'success': False, 'error': f'Count must be between 1 and {MAX_PROVISION_BATCH}'}
+            if total_rounds is not None and not 1 <= total_rounds <= MAX_TOTAL_ROUNDS:
+                return {'success': False, 'error': f'Rounds must be between 1 and {MAX_TOTAL_ROUNDS}'}
+            
+            questions = self._resolve_deck(deck) if deck else None
+            if questions is not None and not questions:
+                return {'success': False, 'error': 'Deck matches no questions'}
+            
+            self.sweep_unclaimed_rooms()
+            expires_at = self.clock() + PROVISIONED_ROOM_TTL
+            
+            # Reserve every code up front so the batch never collides with itself
+            codes = set()
+            while len(codes) < count:
+                code = self.generate_room_code()
+                if code not in codes:
+                    codes.add(code)
+            
+            # One settings dict is shared by the whole batch
+            room_settings = {**default_settings(public, large_room), **(settings or {})}
+            provisioned = []
+            for room_code in sorted(codes):
+                room = Room(
+                    room_code,
+                    None,
+                    max_players=LARGE_ROOM_MAX_PLAYERS if large_room else MAX_PLAYERS,
+                    settings=room_settings,
+                    clock=self.clock
+                )
+                if total_rounds is not None:
+                    room.total_rounds = total_rounds
+                room.deck = questions
+                room.host_token = secrets.token_urlsafe(16)
+                self.rooms[room_code] = room
+                self._unclaimed[room_code] = expires_at
+                self.directory.update(room)
+                provisioned.append({
+                    'room_code': room_code,
+                    'host_token': room.host_token,
+                    'expires_at': expires_at
+                })
+            
+            return {'success': True, 'rooms': provisioned}
+        except Exception as e:
+            print(f"Error provisioning rooms: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    def sweep_unclaimed_rooms(self) -> int:
+        """Expire host tokens of provisioned rooms past their TTL and return how many.
+        
+        Empty rooms are deleted; a room with players hands the host seat to the
+        first of them so it is cleaned up like any other room once they leave.
+        """
+        now = self.clock()
+        expired = 0
+        while self._unclaimed:
+            room_code, expires_at = next(iter(self._unclaimed.items()))
+            if expires_at > now:
+                break
+            del self._unclaimed[room_code]
+            room = self.rooms.get(room_code)
+            if room is None or room.host_token is None:
+                continue
+            expired += 1
+            if room.players:
+                room.claim_host(room.players[0])
+                self.directory.update(room)
+                self._notify_change(room_code)
+            else:
+                self._delete_room(room_code)
+        return expired
+    
+    def _resolve_deck(self, deck: Dict) -> List[Dict]:
+        """Questions matching a deck's ids or categories, shared by every room in a batch"""
+        by_id, by_category = self._get_deck_index()
+        positions = {by_id[str(question_id)] for question_id in deck.get('question_ids') or ()
+                     if str(question_id) in by_id}
+        for category in deck.get('categories') or ():
+            positions.update(by_category.get(category.lower(), ()))
+        # Only the matching questions are decoded; bank order is kept
+        return [self.questions[position] for position in sorted(positions)]
+    
+    def _get_deck_index(self) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+        """Decode the bank once into id and category lookups for deck resolution"""
+        if self._deck_index is None:
+            by_id: Dict[str, int] = {}
+            by_category: Dict[str, List[int]] = {}
+            for position, question in enumerate(self.questions):
+                by_id.setdefault(str(question.get('id')), position)
+                by_category.setdefault(str(question.get('category', '')).lower(), []).append(position)
+            self._deck_index = (by_id, by_category)
+        return self._deck_index
+    
+    def join_room(self, room_code: str, player_name: str, player_sid: str,
+                  host_token: Optional[str] = None) -> Dict:
+        """Join an existing room, claiming its host seat when host_token matches"""
         try:
             if room_code not in self.rooms:
                 return {
@@ -73,36 +228,45 @@ class GameManager:
             
             room = self.rooms[room_code]
             
+            claims_host = False
+            if host_token:
+                # compare_digest only accepts ASCII str, so compare the encoded bytes
+                if not room.host_token or not hmac.compare_digest(
+                    host_token.encode('utf-8'), room.host_token.encode('utf-8')
+                ):
+                    return {'success': False, 'error': 'Invalid host token'}
+                claims_host = True
+                self._unclaimed.pop(room_code, None)
+            
             # Check if player already in room
-            for player in room['players']:
-                if player['sid'] == player_sid:
-                    return {
-                        'success': True,
-                        'room_data': room
-                    }
+            existing = room.players_by_sid.get(player_sid)
+            if existing:
+                if claims_host:
+                    room.claim_host(existing)
+                    self._notify_change(room_code)
+                return {
+                    'success': True,
+                    'room_data': room.to_wire()
+                }
             
-            # Check if room is full (max 10 players)
-            if len(room['players']) >= 10:
+            # Check if room is full
+            if len(room.players) >= room.max_players:
                 return {
                     'success': False,
                     'error': 'Room is full'
                 }
             
             # Add player to room
-            new_player = {
-                'name': player_name,
-                'sid': player_sid,
-                'is_host': False,
-                'score': 0,
-                'answered': False
-            }
-            
-            room['players'].append(new_player)
-            room['scores'][player_sid] = 0
+            player = Player(player_name, player_sid)
+            room.add_player(player)
+            if claims_host:
+                room.claim_host(player)
+            self.directory.update(room)
+            self._notify_change(room_code)
             
             return {
                 'success': True,
-                'room_data': room
+                'room_data': room.to_wire()
             }
         except Exception as e:
             print(f"Error joining room: {e}")
@@ -119,13 +283,17 @@ class GameManager:
             
             room = self.rooms[room_code]
             
-            if len(room['players']) < 2:
+            if len(room.players) < 2:
                 return {'success': False, 'error': 'Need at least 2 players to start'}
             
             # Update room settings
-            room['settings'].update(settings)
-            room['game_started'] = True
-            room['current_round'] = 1
+            room.update_settings(settings)
+            room.game_started = True
+            room.current_round = 1
+            for player in room.players:
+                player.tokens = STARTING_TOKENS - TOKENS_PER_ROUND
+            room.touch()
+            self.directory.update(room)
             
             # Start first round
             return self.start_round(room_code)
@@ -141,25 +309,37 @@ class GameManager:
             
             room = self.rooms[room_code]
             
-            # Select random question
-            question = random.choice(self.questions)
-            room['current_question'] = question
+            # Pick the question fewest present players have seen in earlier games
+            names = [player.name for player in room.players]
+            question = self.seen_questions.choose(room.deck or self.questions, names)
+            self.seen_questions.mark_seen(names, str(question['id']))
             
             # Reset player answered status
-            for player in room['players']:
-                player['answered'] = False
+            room.reset_round(question)
+            heapq.heappush(self._round_deadlines, (room.round_ends_at, room_code, room.current_round))
+            room.record_event('round', None, {'round': room.current_round, 'question_id': question.get('id')})
+            for player in room.players:
+                player.tokens += TOKENS_PER_ROUND
+            self._notify_change(room_code)
             
             return {
                 'success': True,
-                'room_data': room,
+                'room_data': room.to_wire(),
                 'current_question': question
             }
         except Exception as e:
             print(f"Error starting round: {e}")
             return {'success': False, 'error': str(e)}
     
-    def submit_answer(self, room_code: str, player_sid: str, answer_data: Dict) -> Dict:
-        """Submit an answer for a player"""
+    def submit_answer(self, room_code: str, player_sid: str, answer_data: Dict,
+                      rtt: float = 0.0, received_at: Optional[float] = None) -> Dict:
+        """Submit an answer for a player.
+        
+        The response time is measured from question delivery to answer arrival
+        minus the player's round trip time, so slow links are not penalised.
+        The credit is capped at MAX_RTT_ALLOWANCE so a client that delays its
+        pongs cannot buy extra time.
+        """
         try:
             if room_code not in self.rooms:
                 return {'success': False, 'error': 'Room does not exist'}
@@ -167,40 +347,201 @@ class GameManager:
             room = self.rooms[room_code]
             
             # Find player
-            player = None
-            for p in room['players']:
-                if p['sid'] == player_sid:
-                    player = p
-                    break
+            player = room.players_by_sid.get(player_sid)
             
             if not player:
                 return {'success': False, 'error': 'Player not found'}
             
-            if player['answered']:
+            if player.answered:
                 return {'success': False, 'error': 'Already answered'}
             
-            # Mark player as answered
-            player['answered'] = True
-            player['last_answer'] = answer_data
-            
-            # Award points (simple scoring for now)
-            if answer_data.get('answer_index') is not None:
-                points = 100  # Base points for answering
-                room['scores'][player_sid] = room['scores'].get(player_sid, 0) + points
-                player['score'] = room['scores'][player_sid]
+            # The round closed (all answered or the host revealed early); late answers
+            # would drift the tallies away from the cached reveal
+            if room.reveal:
+                return {'success': False, 'error': 'Round is over'}
+            
+            # Answers are judged by when they were sent, so the player's round trip is allowed
+            arrived_at = received_at or self.clock()
+            allowance = min(max(rtt or 0.0, 0.0), MAX_RTT_ALLOWANCE)
+            if room.round_ends_at is not None and arrived_at - allowance > room.round_ends_at:
+                return {'success': False, 'error': 'Time is up'}
+            
+            # Mark player as answered and update the running aggregates
+            response_time = None
+            if room.round_started_at is not None:
+                elapsed = arrived_at - room.round_started_at
+                response_time = round(max(elapsed - allowance, 0.0), 3)
+            room.record_answer(
+                player,
+                answer_data.get('answer_index'),
+                answer_data.get('answer_text'),
+                response_time
+            )
+            room.record_event('answer', player.name, {
+                'answer_index': player.answer_index,
+                'answer_text': player.answer_text[:MAX_TEXT_LENGTH] if player.answer_text else None
+            })
+            
+            # Award points: survey questions score the matched board answer,
+            # multiple choice questions are scored by popularity once the round closes
+            matcher = self._answer_matcher(room.current_question or {})
+            if matcher and player.answer_text:
+                match = matcher.match(player.answer_text)
+                player.last_match = match
+                room.award(player, self.power_ups.settle(player, match['points']) if match else 0)
             
             # Check if all players have answered
-            all_answered = all(p['answered'] for p in room['players'])
+            all_answered = room.answered_count >= len(room.players)
+            
+            if all_answered:
+                self.resolve_round(room_code)
+            self._notify_change(room_code)
             
             return {
                 'success': True,
-                'room_data': room,
-                'all_answered': all_answered
+                'room_data': room.to_wire(),
+                'all_answered': all_answered,
+                'player_score': player.score
             }
         except Exception as e:
             print(f"Error submitting answer: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _answer_matcher(self, question: Dict) -> Optional[AnswerMatcher]:
+        """Get the prebuilt matcher for a question, building it for bank questions"""
+        question_id = question.get('id')
+        matcher = self.answer_matchers.get(question_id)
+        if matcher is not None:
+            self.answer_matchers.move_to_end(question_id)
+        elif question.get('answers'):
+            matcher = AnswerMatcher(question['answers'])
+            self.answer_matchers[question_id] = matcher
+            if len(self.answer_matchers) > MAX_CACHED_MATCHERS:
+                self.answer_matchers.popitem(last=False)
+        return matcher
+    
+    def resolve_round(self, room_code: str) -> Optional[Dict]:
+        """Tally answers, award popularity points and cache the reveal payload.
+        
+        Runs once per round; later calls return the cached payload.
+        """
+        room = self.rooms.get(room_code)
+        if not room or not room.current_question:
+            return None
+        if room.reveal:
+            return room.reveal
+        
+        question = room.current_question
+        option_counts = list(room.option_histogram)
+        answered = sum(option_counts)
+        
+        # Points scale with the share of players who picked the same option
+        for player in room.players:
+            if player.answer_index is not None:
+                points = self.power_ups.settle(player, round(100 * option_counts[player.answer_index] / answered))
+                room.award(player, points)
+        
+        top_count = max(option_counts) if option_counts else 0
+        top_options = [i for i, count in enumerate(option_counts) if count and count == top_count]
+        self._settle_steals(room, top_options)
+        # Survey points were awarded as answers came in, so take each player's whole gain this round
+        round_scores = {p.sid: p.score - p.round_start_score for p in room.players}
+        self.achievements.round_resolved(room, top_options)
+        
+        reveal = {
+            'round': room.current_round,
+            'question_id': question.get('id'),
+            'option_counts': option_counts,
+            'total_answers': answered,
+            'top_options': top_options,
+            'fastest': self._fastest_player(room)
+        }
+        if room.is_large:
+            # Individual results go only to their owners; everyone gets the top-N board
+            reveal['leaderboard'] = room.leaderboard()
+        else:
+            reveal['round_scores'] = round_scores
+            reveal['scores'] = room.scores()
+            reveal['response_times'] = {p.sid: p.response_time for p in room.players}
+        room.round_scores = round_scores
+        room.reveal = reveal
+        room.record_event('reveal', None, {'option_counts': option_counts, 'top_options': top_options})
+        room.record_event('scores', None, room.leaderboard())
+        room.touch()
+        self._notify_change(room_code)
+        return reveal
+    
+    def expire_rounds(self) -> List[str]:
+        """Resolve rounds whose deadline has passed and return their room codes.
+        
+        Deadlines are checked against the room when they come due, so rounds
+        extended by Time Freeze are re-queued and finished rounds are skipped.
+        """
+        now = self.clock()
+        expired = []
+        while self._round_deadlines and self._round_deadlines[0][0] <= now:
+            _, room_code, round_number = heapq.heappop(self._round_deadlines)
+            room = self.rooms.get(room_code)
+            if (room is None or room.current_round != round_number or room.reveal
+                    or room.current_question is None or room.game_ended):
+                continue
+            if room.round_ends_at > now:
+                heapq.heappush(self._round_deadlines, (room.round_ends_at, room_code, round_number))
+                continue
+            self.resolve_round(room_code)
+            expired.append(room_code)
+        return expired
+    
+    def _fastest_player(self, room: Room) -> Optional[Dict]:
+        """Player with the lowest latency-compensated response time this round"""
+        timed = [p for p in room.players if p.response_time is not None]
+        if not timed:
+            return None
+        fastest = min(timed, key=lambda p: p.response_time)
+        return {'name': fastest.name, 'response_time': fastest.response_time}
+    
+    def _settle_steals(self, room: Room, top_options: List[int]) -> None:
+        """A thief who picked a top answer takes points from the leading player who missed"""
+        for thief in room.players:
+            if not thief.stealing:
+                continue
+            thief.stealing = False
+            if thief.answer_index not in top_options:
+                continue
+            victims = [
+                p for p in room.players
+                if p is not thief and p.answer_index not in top_options and p.score > 0
+            ]
+            if not victims:
+                continue
+            victim = max(victims, key=lambda p: p.score)
+            taken = min(STEAL_POINTS, victim.score)
+            room.award(victim, -taken)
+            room.award(thief, taken)
+            self.achievements.steal(room, thief)
+    
+    def use_power_up(self, room_code: str, player_sid: str, card_type: str) -> Dict:
+        """Validate and apply a chaos card or power-up for a player"""
+        try:
+            room = self.rooms.get(room_code)
+            if not room:
+                return {'success': False, 'error': 'Room does not exist'}
+            
+            player = room.players_by_sid.get(player_sid)
+            if not player:
+                return {'success': False, 'error': 'Player not found'}
+            
+            result = self.power_ups.use(room, player, card_type)
+            if result.get('success'):
+                result['player_name'] = player.name
+                room.record_event('card', player.name, result['card_type'])
+                self.achievements.card_played(room, player, result['card_type'])
+                self._notify_change(room_code)
+            return result
+        except Exception as e:
+            print(f"Error using power-up: {e}")
+            return {'success': False, 'error': str(e)}
+    
     def next_round(self, room_code: str) -> Dict:
         """Move to the next round"""
         try:
@@ -209,16 +550,31 @@ class GameManager:
             
             room = self.rooms[room_code]
             
-            room['current_round'] += 1
+            # The host may advance before everyone answered; score the open round first
+            if room.current_question and not room.reveal:
+                self.resolve_round(room_code)
+            
+            room.current_round += 1
+            room.touch()
             
-            if room['current_round'] > room['total_rounds']:
+            if room.current_round > room.total_rounds:
                 # Game ended
-                room['game_ended'] = True
+                room.game_ended = True
+                self.achievements.game_ended(room)
+                self.directory.update(room)
+                self._notify_change(room_code)
+                if room.is_large:
+                    return {
+                        'success': True,
+                        'game_ended': True,
+                        'leaderboard': room.leaderboard(),
+                        'room_data': room.to_wire()
+                    }
                 return {
                     'success': True,
                     'game_ended': True,
-                    'final_scores': room['scores'],
-                    'room_data': room
+                    'final_scores': room.scores(),
+                    'room_data': room.to_wire()
                 }
             else:
                 # Start next round
@@ -227,10 +583,159 @@ class GameManager:
             print(f"Error advancing round: {e}")
             return {'success': False, 'error': str(e)}
     
-    def get_room(self, room_code: str) -> Optional[Dict]:
+    def add_spectator(self, room_code: str, name: str, sid: str) -> Dict:
+        """Add a read-only viewer to a room"""
+        try:
+            if room_code not in self.rooms:
+                return {'success': False, 'error': 'Room does not exist'}
+            
+            self.spectators.setdefault(room_code, {})[sid] = name
+            
+            return {
+                'success': True,
+                'snapshot': self.get_spectator_snapshot(room_code)
+            }
+        except Exception as e:
+            print(f"Error adding spectator: {e}")
+            return {'success': False, 'error': str(e)}
+    
+    def remove_spectator(self, room_code: str, sid: str) -> None:
+        """Remove a viewer from a room"""
+        viewers = self.spectators.get(room_code)
+        if viewers is not None:
+            viewers.pop(sid, None)
+            if not viewers:
+                del self.spectators[room_code]
+    
+    def get_spectator_snapshot(self, room_code: str) -> Optional[Dict]:
+        """Build the read-only view of a room sent to spectators"""
+        room = self.rooms.get(room_code)
+        if not room:
+            return None
+        
+        return {
+            'room_code': room_code,
+            'game_started': room.game_started,
+            'game_ended': room.game_ended,
+            'current_round': room.current_round,
+            'total_rounds': room.total_rounds,
+            'current_question': room.current_question,
+            'players': room.leaderboard() if room.is_large else [
+                {'name': p.name, 'score': p.score, 'answered': p.answered}
+                for p in room.players
+            ],
+            'player_count': len(room.players),
+            'answered_count': room.answered_count,
+            'reveal': room.reveal,
+            'spectator_count': len(self.spectators.get(room_code, {}))
+        }
+    
+    def get_answer_progress(self, room_code: str) -> Optional[Dict]:
+        """Aggregate-only answer update for large rooms"""
+        room = self.rooms.get(room_code)
+        if not room:
+            return None
+        
+        return {
+            'room_code': room_code,
+            'current_round': room.current_round,
+            'answered_count': room.answered_count,
+            'player_count': len(room.players),
+            'option_histogram': room.option_histogram
+        }
+    
+    def get_roster(self, room_code: str, page: int = 1, per_page: int = 50) -> Optional[Dict]:
+        """Get one page of a room's players"""
+        room = self.rooms.get(room_code)
+        if not room:
+            return None
+        
+        start = (page - 1) * per_page
+        return {
+            'room_code': room_code,
+            'players': [
+                {'name': p.name, 'score': p.score, 'answered': p.answered, 'is_host': p.is_host}
+                for p in room.players[start:start + per_page]
+            ],
+            'page': page,
+            'per_page': per_page,
+            'total': len(room.players)
+        }
+    
+    def get_player_result(self, room_code: str, player_sid: str) -> Optional[Dict]:
+        """Get a single player's score and last round points"""
+        room = self.rooms.get(room_code)
+        player = room.players_by_sid.get(player_sid) if room else None
+        if not player:
+            return None
+        
+        return {
+            'score': player.score,
+            'round_points': (room.round_scores or {}).get(player_sid, 0),
+            'response_time': player.response_time
+        }
+    
+    def find_quick_match(self) -> Optional[str]:
+        """Get the fullest public room that still has open seats"""
+        return self.directory.fullest_open()
+    
+    def list_public_rooms(self, state: str = 'waiting', page: int = 1, per_page: int = 20) -> Dict:
+        """Get a page of the public room directory"""
+        return self.directory.list_rooms(state, page, per_page)
+    
+    def get_room(self, room_code: str) -> Optional[Room]:
         """Get room data"""
         return self.rooms.get(room_code)
     
+    def wait_for_change(self, room_code: str, since_version: int, timeout: float) -> Optional[Room]:
+        """Block until a room's version differs from since_version, it is deleted, or timeout"""
+        deadline = time.monotonic() + timeout
+        with self._waiters_lock:
+            changed = self._room_waiters.get(room_code)
+            if changed is None:
+                changed = self._room_waiters[room_code] = threading.Condition(self._waiters_lock)
+            self._waiter_counts[room_code] = self._waiter_counts.get(room_code, 0) + 1
+            try:
+                while True:
+                    room = self.rooms.get(room_code)
+                    if room is None or room.version != since_version:
+                        return room
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return room
+                    changed.wait(remaining)
+            finally:
+                self._waiter_counts[room_code] -= 1
+                if not self._waiter_counts[room_code]:
+                    del self._waiter_counts[room_code]
+                    del self._room_waiters[room_code]
+    
+    def _notify_change(self, room_code: str) -> None:
+        """Wake the long-pollers of one room"""
+        with self._waiters_lock:
+            changed = self._room_waiters.get(room_code)
+            if changed is not None:
+                changed.notify_all()
+    
+    def memory_report(self) -> Dict:
+        """Approximate memory held by room state"""
+        room_bytes = sum(room.memory_size() for room in self.rooms.values())
+        idle_rooms = [room for room in self.rooms.values() if not room.game_started]
+        idle_bytes = sum(room.memory_size() for room in idle_rooms)
+        # Rooms share settings dicts until one is changed, so count each dict once
+        shared_settings = {id(room.settings): room.settings for room in self.rooms.values()}
+        return {
+            'rooms': len(self.rooms),
+            'players': sum(len(room.players) for room in self.rooms.values()),
+            'room_bytes': room_bytes + sys.getsizeof(self.rooms),
+            'bytes_per_room': room_bytes // len(self.rooms) if self.rooms else 0,
+            'idle_rooms': len(idle_rooms),
+            'bytes_per_idle_room': idle_bytes // len(idle_rooms) if idle_rooms else 0,
+            'settings_dicts': len(shared_settings),
+            'settings_bytes': sum(settings_size(settings) for settings in shared_settings.values()),
+            'seen_filter_bytes': self.seen_questions.memory_size()
+        }
+    
     def remove_player(self, room_code: str, player_sid: str) -> Dict:
         """Remove a player from a room"""
         try:
@@ -239,30 +744,41 @@ class GameManager:
             
             room = self.rooms[room_code]
             
-            # Find and remove player
-            room['players'] = [p for p in room['players'] if p['sid'] != player_sid]
-            
-            # Remove from scores
-            if player_sid in room['scores']:
-                del room['scores'][player_sid]
+            # Find and remove player; the next player becomes host if needed
+            room.remove_player(player_sid)
             
-            # If no players left, delete room
-            if not room['players']:
-                del self.rooms[room_code]
+            # If no players left, delete room unless it still awaits its host
+            if not room.players and room.host_token is None:
+                self._delete_room(room_code)
                 return {'success': True, 'room_deleted': True}
             
-            # If host left, assign new host
-            if not any(p['is_host'] for p in room['players']):
-                room['players'][0]['is_host'] = True
+            # The leaver may have been the last player the round was waiting on
+            round_ended = (
+                room.current_question is not None and not room.reveal and not room.game_ended
+                and room.answered_count >= len(room.players)
+            )
+            if round_ended:
+                self.resolve_round(room_code)
+            
+            self.directory.update(room)
+            self._notify_change(room_code)
             
             return {
                 'success': True,
-                'room_data': room
+                'room_data': room.to_wire(),
+                'round_ended': round_ended
             }
         except Exception as e:
             print(f"Error removing player: {e}")
             return {'success': False, 'error': str(e)}
     
+    def _delete_room(self, room_code: str) -> None:
+        del self.rooms[room_code]
+        self.directory.remove(room_code)
+        self.spectators.pop(room_code, None)
+        self.achievements.pop_unlocks(room_code)
+        self._notify_change(room_code)
+    
     def _load_questions(self) -> List[Dict]:
         """Load multiple choice questions"""
         return [
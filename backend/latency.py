@@ -0,0 +1,104 @@
+import functools
+import logging
+import time
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+# Weight of each new RTT sample in the moving average
+RTT_ALPHA = 0.2
+
+
+def record_heartbeat(client: dict) -> None:
+    """Mark a connected client as alive"""
+    client['last_seen'] = time.time()
+
+
+def record_rtt(client: dict, sample: float) -> None:
+    """Fold an RTT sample (seconds) into the client's smoothed RTT"""
+    if client.get('rtt') is None:
+        client['rtt'] = sample
+    else:
+        client['rtt'] = (1 - RTT_ALPHA) * client['rtt'] + RTT_ALPHA * sample
+    record_heartbeat(client)
+
+
+class LatencyMonitor:
+    """Probes every connected client's round trip time and evicts zombies.
+
+    A background task emits `rtt_probe` to each client on an interval; the
+    client acks it and the elapsed time becomes an RTT sample. Clients that
+    never ack keep an unknown (None) RTT. Any inbound event, probe ack or
+    engine.io pong counts as a heartbeat; clients with none for
+    `heartbeat_timeout` seconds are handed to `evict`.
+    """
+
+    def __init__(self, socketio, clients: dict, evict, interval: float = 5.0,
+                 heartbeat_timeout: float = 60.0):
+        self.socketio = socketio
+        self.clients = clients
+        self.evict = evict
+        self.interval = interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.evicted = 0
+        self._started = False
+
+    def start(self) -> None:
+        """Start the probe loop once"""
+        if self._started:
+            return
+        self._started = True
+        self.socketio.start_background_task(self._run)
+
+    def touch(self, get_sid):
+        """Decorator that counts every call of a socket handler as a heartbeat"""
+        def decorator(handler):
+            @functools.wraps(handler)
+            def wrapper(*args, **kwargs):
+                client = self.clients.get(get_sid())
+                if client is not None:
+                    record_heartbeat(client)
+                return handler(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _transport_alive(self, sid: str) -> bool:
+        """Whether engine.io still gets pongs from the client's transport"""
+        try:
+            server = self.socketio.server
+            eio_sid = server.manager.eio_sid_from_sid(sid, '/')
+            socket = server.eio.sockets.get(eio_sid) if eio_sid else None
+        except AttributeError:
+            return False
+        if socket is None or socket.closed:
+            return False
+        # last_ping is cleared when a pong arrives and set again when the next ping goes out
+        return socket.last_ping is None or time.time() - socket.last_ping <= server.eio.ping_timeout
+
+    def _on_ack(self, sid: str, sent_at: float, *args) -> None:
+        client = self.clients.get(sid)
+        if client is not None:
+            record_rtt(client, time.monotonic() - sent_at)
+
+    def _run(self) -> None:
+        while True:
+            self.socketio.sleep(self.interval)
+            now = time.time()
+            for sid, client in list(self.clients.items()):
+                try:
+                    if now - client.get('last_seen', now) > self.heartbeat_timeout:
+                        if self._transport_alive(sid):
+                            record_heartbeat(client)
+                        else:
+                            logger.info(f"🧟 Evicting unresponsive client: {sid}")
+                            self.evicted += 1
+                            self.evict(sid)
+                            continue
+                    self.socketio.emit(
+                        'rtt_probe',
+                        {},
+                        to=sid,
+                        callback=partial(self._on_ack, sid, time.monotonic())
+                    )
+                except Exception as e:
+                    logger.error(f"Latency probe error for {sid}: {e}")
@@ -1,9 +1,23 @@
+import atexit
+import hmac
 import os
 import logging
-from flask import Flask, request, jsonify, send_from_directory, send_file
+import signal
+import sys
+import time
+from flask import Flask, Response, request, jsonify, send_from_directory, send_file
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_cors import CORS
+from clips import EventRing, export_clip
 from game_manager import GameManager
+from latency import LatencyMonitor
+from models.user import db
+from outbound import OutboundQueues
+from payloads import MAX_MESSAGE_BYTES, SETTINGS_SCHEMA, PayloadGuard
+from profiling import EventProfiler
+from routes.game import game_bp
+from routes.user import user_bp
+from spectator_feed import AnswerProgressFeed, RoomUpdateFeed, SpectatorFeed, spectator_room
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -16,13 +30,28 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'roast-royale-secret-key
 # Configure CORS
 CORS(app, origins="*", allow_headers=["Content-Type", "Authorization"])
 
+# Content API (answer boards, guess matching, catalogs); mounted apart from
+# /api/game so it never shadows the live game routes below
+app.register_blueprint(game_bp, url_prefix='/api/content')
+
+# User accounts; SQLite next to the app unless DATABASE_URL points elsewhere
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get(
+    'DATABASE_URL',
+    'sqlite:///' + os.path.join(os.path.dirname(os.path.abspath(__file__)), 'roast_royale.db')
+)
+db.init_app(app)
+with app.app_context():
+    db.create_all()
+app.register_blueprint(user_bp, url_prefix='/api')
+
 # Initialize SocketIO with CORS support
 socketio = SocketIO(
     app, 
     cors_allowed_origins="*",
     logger=True,
     engineio_logger=True,
-    allow_unsafe_werkzeug=True
+    allow_unsafe_werkzeug=True,
+    max_http_buffer_size=int(os.environ.get('MAX_MESSAGE_BYTES', MAX_MESSAGE_BYTES))
 )
 
 # Initialize Game Manager
@@ -31,6 +60,69 @@ game_manager = GameManager()
 # Store connected clients
 connected_clients = {}
 
+# Upper bound for long-poll requests on the room state endpoint
+LONG_POLL_MAX_WAIT = 30
+
+# Longest window a viral clip export can cover
+CLIP_MAX_SECONDS = 300
+
+# Smoothed RTT probes and zombie eviction; started with the first connection
+latency_monitor = LatencyMonitor(
+    socketio,
+    connected_clients,
+    evict=lambda sid: evict_client(sid),
+    interval=float(os.environ.get('RTT_PROBE_INTERVAL', 5.0)),
+    heartbeat_timeout=float(os.environ.get('HEARTBEAT_TIMEOUT', 60.0))
+)
+
+# Write any buffered achievement unlocks on shutdown
+atexit.register(game_manager.achievements.flush)
+
+def handle_sigterm(signum, frame):
+    """Persist buffered unlocks, then exit normally"""
+    game_manager.achievements.flush()
+    sys.exit(0)
+
+# Schema and size checks run before every game event handler
+payloads = PayloadGuard(emit)
+
+# Admin endpoints are disabled unless ADMIN_TOKEN is set
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+# On-demand sampling profiler for socket handlers; off until an admin enables it
+profiler = EventProfiler()
+
+# Room broadcasts that hold back and supersede messages for slow clients
+outbound = OutboundQueues(
+    socketio,
+    max_backlog=int(os.environ.get('OUTBOUND_MAX_BACKLOG', 32)),
+    max_queued=int(os.environ.get('OUTBOUND_MAX_QUEUED', 64))
+)
+
+# Throttled state snapshots for spectators
+spectator_feed = SpectatorFeed(
+    socketio,
+    game_manager,
+    interval=float(os.environ.get('SPECTATOR_SNAPSHOT_INTERVAL', 1.0)),
+    outbound=outbound
+)
+
+# Answer counts for large rooms, coalesced instead of broadcast per answer
+answer_progress_feed = AnswerProgressFeed(
+    socketio,
+    game_manager,
+    interval=float(os.environ.get('ANSWER_PROGRESS_INTERVAL', 0.5)),
+    outbound=outbound
+)
+
+# Roster changes in large rooms, coalesced instead of broadcast per join or leave
+room_update_feed = RoomUpdateFeed(
+    socketio,
+    game_manager,
+    interval=float(os.environ.get('ROOM_UPDATE_INTERVAL', 0.5)),
+    outbound=outbound
+)
+
 @app.route('/')
 def serve_index():
     """Serve the React app"""
@@ -88,22 +180,204 @@ def get_game_stats():
         return jsonify({
             'active_rooms': len(game_manager.rooms),
             'connected_players': len(connected_clients),
-            'total_questions': len(game_manager.questions)
+            'total_questions': len(game_manager.questions),
+            'spectators': sum(len(viewers) for viewers in game_manager.spectators.values()),
+            'spectator_snapshots_sent': spectator_feed.snapshots_sent,
+            'spectator_updates_coalesced': spectator_feed.updates_coalesced,
+            'answer_progress_sent': answer_progress_feed.snapshots_sent,
+            'answer_progress_coalesced': answer_progress_feed.updates_coalesced,
+            'room_updates_sent': room_update_feed.snapshots_sent,
+            'room_updates_coalesced': room_update_feed.updates_coalesced,
+            'outbound': outbound.report(),
+            'rejected_payloads': payloads.report(),
+            'achievements_unlocked': game_manager.achievements.unlocks
         })
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/game/memory')
+def get_memory_report():
+    """Get approximate memory used by room state"""
+    try:
+        return jsonify(game_manager.memory_report())
+    except Exception as e:
+        logger.error(f"Error building memory report: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/game/rooms')
+def list_public_rooms():
+    """List public rooms, paginated"""
+    try:
+        state = request.args.get('state', 'waiting')
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+        return jsonify(game_manager.list_public_rooms(state, page, per_page))
+    except Exception as e:
+        logger.error(f"Error listing rooms: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/game/rooms/<room_code>')
+def get_room_state(room_code):
+    """Get a room snapshot for clients without a websocket.
+    
+    The room version is the ETag; a matching If-None-Match returns 304, or
+    with ?wait=<seconds> blocks until the room changes.
+    """
+    try:
+        room_code = room_code.strip().upper()
+        room = game_manager.get_room(room_code)
+        if not room:
+            return jsonify({'error': 'Room not found'}), 404
+        
+        if room_etag(room) in request.if_none_match:
+            wait = min(max(request.args.get('wait', 0, type=float), 0), LONG_POLL_MAX_WAIT)
+            if wait:
+                room = game_manager.wait_for_change(room_code, room.version, wait)
+                if not room:
+                    return jsonify({'error': 'Room not found'}), 404
+            if room_etag(room) in request.if_none_match:
+                return Response(status=304, headers={'ETag': f'"{room_etag(room)}"'})
+        
+        return Response(
+            room.to_json(),
+            mimetype='application/json',
+            headers={'ETag': f'"{room_etag(room)}"', 'Cache-Control': 'no-cache'}
+        )
+    except Exception as e:
+        logger.error(f"Error getting room state: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/game/rooms/<room_code>/clip')
+def export_room_clip(room_code):
+    """Export the last N seconds of a room's events as a gzipped JSON clip"""
+    try:
+        room = game_manager.get_room(room_code.strip().upper())
+        if not room:
+            return jsonify({'error': 'Room not found'}), 404
+        if not room.settings.get('viral_clips'):
+            return jsonify({'error': 'Viral clips are disabled in this room'}), 404
+        # Nothing has been recorded yet when the ring was never created
+        ring = room.events or EventRing(clock=room.clock)
+        
+        seconds = min(max(request.args.get('seconds', 30, type=float), 1), CLIP_MAX_SECONDS)
+        return Response(
+            export_clip(room.room_code, ring, seconds),
+            mimetype='application/gzip',
+            headers={'Content-Disposition': f'attachment; filename=clip-{room.room_code}.json.gz'}
+        )
+    except Exception as e:
+        logger.error(f"Error exporting clip: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/profiling', methods=['GET', 'POST'])
+def admin_profiling():
+    """Configure the socket handler profiler or dump its samples (admin only)"""
+    if not is_admin_request():
+        return jsonify({'error': 'Forbidden'}), 403
+    try:
+        if request.method == 'POST':
+            data = request.get_json(silent=True) or {}
+            if data.get('reset'):
+                profiler.reset()
+            profiler.configure(
+                data.get('enabled', profiler.enabled),
+                sample_rate=data.get('sample_rate'),
+                interval=data.get('interval')
+            )
+        if request.args.get('format') == 'folded':
+            return Response(profiler.folded(request.args.get('event')), mimetype='text/plain')
+        return jsonify(profiler.report(top=request.args.get('top', 20, type=int)))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid profiling settings: {e}'}), 400
+    except Exception as e:
+        logger.error(f"Error in profiling endpoint: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/rooms', methods=['POST'])
+def provision_rooms():
+    """Pre-create rooms for a scheduled event (admin only)"""
+    if not is_admin_request():
+        return jsonify({'error': 'Forbidden'}), 403
+    try:
+        data = request.get_json(silent=True) or {}
+        count = data.get('count', 1)
+        total_rounds = data.get('total_rounds')
+        deck = data.get('deck')
+        settings = data.get('settings') or {}
+        
+        if not isinstance(count, int) or (total_rounds is not None and not isinstance(total_rounds, int)):
+            return jsonify({'error': 'count and total_rounds must be integers'}), 400
+        if deck is not None and not (
+            isinstance(deck, dict)
+            and all(isinstance(deck.get(key) or [], list) for key in ('question_ids', 'categories'))
+        ):
+            return jsonify({'error': 'deck must have question_ids and/or categories lists'}), 400
+        if not isinstance(settings, dict) or any(
+            key not in SETTINGS_SCHEMA or not isinstance(value, bool) for key, value in settings.items()
+        ):
+            return jsonify({'error': f'settings may only set {", ".join(SETTINGS_SCHEMA)} to true or false'}), 400
+        
+        result = game_manager.provision_rooms(
+            count,
+            settings=settings,
+            total_rounds=total_rounds,
+            deck=deck,
+            public=bool(data.get('public')),
+            large_room=bool(data.get('large_room'))
+        )
+        if not result.get('success'):
+            return jsonify({'error': result.get('error')}), 400
+        
+        logger.info(f"🏟️ Provisioned {len(result['rooms'])} rooms")
+        return jsonify({'rooms': result['rooms']}), 201
+    except Exception as e:
+        logger.error(f"Error provisioning rooms: {e}")
+        return jsonify({'error': str(e)}), 500
+
+# Seconds between checks for rounds whose timer ran out
+ROUND_TIMER_INTERVAL = float(os.environ.get('ROUND_TIMER_INTERVAL', 1.0))
+round_timer_started = False
+
+def start_round_timer():
+    """Start the round timer loop once"""
+    global round_timer_started
+    if round_timer_started:
+        return
+    round_timer_started = True
+    socketio.start_background_task(run_round_timer)
+
+def run_round_timer():
+    """Close rounds at round_ends_at even when some players never answer"""
+    while True:
+        socketio.sleep(ROUND_TIMER_INTERVAL)
+        try:
+            for room_code in game_manager.expire_rounds():
+                room = game_manager.get_room(room_code)
+                if room:
+                    logger.info(f"⏰ Round timed out in room: {room_code}")
+                    announce_round_end(room_code, room.to_wire())
+                    spectator_feed.mark_dirty(room_code)
+        except Exception as e:
+            logger.error(f"Round timer error: {e}")
+
 # SocketIO Events
 @socketio.on('connect')
+@profiler.profile('connect')
 def handle_connect():
     """Handle client connection"""
     try:
         client_id = request.sid
         connected_clients[client_id] = {
             'connected_at': time.time(),
-            'room_code': None
+            'last_seen': time.time(),
+            'rtt': None,
+            'room_code': None,
+            'spectating': None
         }
+        latency_monitor.start()
+        outbound.start()
+        start_round_timer()
         
         logger.info(f"🔗 Client connected: {client_id}")
         emit('connected', {
@@ -115,27 +389,27 @@ def handle_connect():
         emit('error', {'message': 'Connection failed'})
 
 @socketio.on('disconnect')
+@profiler.profile('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
     try:
         client_id = request.sid
-        
-        if client_id in connected_clients:
-            room_code = connected_clients[client_id].get('room_code')
-            if room_code:
-                # Remove player from room
-                result = game_manager.remove_player(room_code, client_id)
-                if result.get('success'):
-                    # Notify other players in the room
-                    socketio.emit('room_updated', result.get('room_data'), room=room_code)
-            
-            del connected_clients[client_id]
-        
+        release_client(client_id)
         logger.info(f"🔌 Client disconnected: {client_id}")
     except Exception as e:
         logger.error(f"Disconnection error: {e}")
 
+@socketio.on('ping')
+@profiler.profile('ping')
+@latency_monitor.touch(lambda: request.sid)
+def handle_ping(data):
+    """Handle client heartbeat; echo the payload so the client can time it"""
+    return data
+
 @socketio.on('create_room')
+@profiler.profile('create_room')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('create_room')
 def handle_create_room(data):
     """Handle room creation"""
     try:
@@ -148,7 +422,12 @@ def handle_create_room(data):
             return
         
         # Create room
-        result = game_manager.create_room(player_name, client_id)
+        result = game_manager.create_room(
+            player_name,
+            client_id,
+            public=bool(data.get('public')),
+            large_room=bool(data.get('large_room'))
+        )
         
         if result.get('success'):
             room_code = result['room_code']
@@ -174,6 +453,9 @@ def handle_create_room(data):
         emit('room_error', {'message': 'Server error creating room'})
 
 @socketio.on('join_room')
+@profiler.profile('join_room')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('join_room')
 def handle_join_room(data):
     """Handle joining a room"""
     try:
@@ -190,8 +472,8 @@ def handle_join_room(data):
             emit('join_error', {'message': 'Player name too long'})
             return
         
-        # Join room
-        result = game_manager.join_room(room_code, player_name, client_id)
+        # Join room; a provisioned room's host token also claims the host seat
+        result = game_manager.join_room(room_code, player_name, client_id, data.get('host_token'))
         
         if result.get('success'):
             room_data = result['room_data']
@@ -211,7 +493,8 @@ def handle_join_room(data):
             })
             
             # Notify other players in the room
-            socketio.emit('room_updated', room_data, room=room_code)
+            broadcast_room_update(room_code, room_data)
+            spectator_feed.mark_dirty(room_code)
         else:
             emit('join_error', {'message': result.get('error', 'Failed to join room')})
     
@@ -219,7 +502,70 @@ def handle_join_room(data):
         logger.error(f"Join room error: {e}")
         emit('join_error', {'message': 'Server error joining room'})
 
+@socketio.on('spectate_room')
+@profiler.profile('spectate_room')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('spectate_room')
+def handle_spectate_room(data):
+    """Handle joining a room as a spectator"""
+    try:
+        room_code = data.get('room_code', '').strip().upper()
+        name = data.get('name', '').strip()[:20] or 'Spectator'
+        client_id = request.sid
+        
+        if not room_code:
+            emit('join_error', {'message': 'Room code required'})
+            return
+        
+        # A client spectates one room at a time; leave the previous one first
+        previous = connected_clients.get(client_id, {}).get('spectating')
+        if previous and previous != room_code:
+            game_manager.remove_spectator(previous, client_id)
+            leave_room(spectator_room(previous))
+            connected_clients[client_id]['spectating'] = None
+        
+        result = game_manager.add_spectator(room_code, name, client_id)
+        
+        if result.get('success'):
+            # Spectators only join the sub-room, never the players' room
+            join_room(spectator_room(room_code))
+            connected_clients[client_id]['spectating'] = room_code
+            spectator_feed.start()
+            
+            logger.info(f"👀 {name} is spectating room: {room_code}")
+            emit('spectate_success', result['snapshot'])
+        else:
+            emit('join_error', {'message': result.get('error', 'Failed to spectate room')})
+    
+    except Exception as e:
+        logger.error(f"Spectate room error: {e}")
+        emit('join_error', {'message': 'Server error spectating room'})
+
+@socketio.on('quick_match')
+@profiler.profile('quick_match')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('quick_match')
+def handle_quick_match(data):
+    """Handle joining the fullest open public room"""
+    try:
+        room_code = game_manager.find_quick_match()
+        if not room_code:
+            emit('join_error', {'message': 'No open public rooms'})
+            return
+        
+        handle_join_room({
+            'room_code': room_code,
+            'player_name': data.get('player_name', '')
+        })
+    
+    except Exception as e:
+        logger.error(f"Quick match error: {e}")
+        emit('join_error', {'message': 'Server error finding a room'})
+
 @socketio.on('start_game')
+@profiler.profile('start_game')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('start_game')
 def handle_start_game(data):
     """Handle game start"""
     try:
@@ -237,7 +583,7 @@ def handle_start_game(data):
             emit('game_error', {'message': 'Room not found'})
             return
         
-        if room['host_sid'] != client_id:
+        if room.host_sid != client_id:
             emit('game_error', {'message': 'Only host can start the game'})
             return
         
@@ -246,7 +592,8 @@ def handle_start_game(data):
         
         if result.get('success'):
             logger.info(f"🎮 Game started in room: {room_code}")
-            socketio.emit('game_started', result, room=room_code)
+            outbound.emit_to_room('game_started', result, room_code)
+            spectator_feed.mark_dirty(room_code)
         else:
             emit('game_error', {'message': result.get('error', 'Failed to start game')})
     
@@ -255,6 +602,9 @@ def handle_start_game(data):
         emit('game_error', {'message': 'Server error starting game'})
 
 @socketio.on('submit_answer')
+@profiler.profile('submit_answer')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('submit_answer')
 def handle_submit_answer(data):
     """Handle answer submission"""
     try:
@@ -266,21 +616,33 @@ def handle_submit_answer(data):
             emit('answer_error', {'message': 'Room code required'})
             return
         
+        client = connected_clients.get(client_id, {})
+        
         # Submit answer
-        result = game_manager.submit_answer(room_code, client_id, answer_data)
+        result = game_manager.submit_answer(
+            room_code,
+            client_id,
+            answer_data,
+            rtt=client.get('rtt') or 0.0,
+            received_at=time.time()
+        )
         
         if result.get('success'):
             logger.info(f"📝 Answer submitted in room: {room_code}")
             
-            # Notify all players
-            socketio.emit('game_state_updated', result['room_data'], room=room_code)
+            # Notify all players; large rooms only get aggregates, and the
+            # player's own score goes to them alone
+            if is_large_room(room_code):
+                answer_progress_feed.start()
+                answer_progress_feed.mark_dirty(room_code)
+                emit('answer_accepted', {'score': result['player_score']})
+            else:
+                outbound.emit_to_room('game_state_updated', result['room_data'], room_code)
+            spectator_feed.mark_dirty(room_code)
             
             # If all players answered, show results
             if result.get('all_answered'):
-                socketio.emit('round_ended', {
-                    'show_results': True,
-                    'room_data': result['room_data']
-                }, room=room_code)
+                announce_round_end(room_code, result['room_data'])
         else:
             emit('answer_error', {'message': result.get('error', 'Failed to submit answer')})
     
@@ -288,7 +650,69 @@ def handle_submit_answer(data):
         logger.error(f"Submit answer error: {e}")
         emit('answer_error', {'message': 'Server error submitting answer'})
 
+@socketio.on('reveal_answer')
+@profiler.profile('reveal_answer')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('reveal_answer')
+def handle_reveal_answer(data):
+    """Handle answer reveal"""
+    try:
+        room_code = data.get('room_code')
+        client_id = request.sid
+        
+        room = game_manager.get_room(room_code) if room_code else None
+        if not room:
+            emit('round_error', {'message': 'Room not found'})
+            return
+        
+        # The host may close the round early; everyone else gets the cached result
+        if not room.reveal and room.host_sid != client_id:
+            emit('round_error', {'message': 'Round has not ended yet'})
+            return
+        
+        reveal = game_manager.resolve_round(room_code)
+        if reveal is None:
+            emit('round_error', {'message': 'No active round'})
+            return
+        
+        if room.host_sid == client_id:
+            outbound.emit_to_room('answer_revealed', reveal, room_code)
+            send_player_results(room_code)
+            send_unlocks(room_code)
+            spectator_feed.mark_dirty(room_code)
+        else:
+            emit('answer_revealed', reveal)
+    
+    except Exception as e:
+        logger.error(f"Reveal answer error: {e}")
+        emit('round_error', {'message': 'Server error revealing answer'})
+
+@socketio.on('get_roster')
+@profiler.profile('get_roster')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('get_roster')
+def handle_get_roster(data):
+    """Handle a request for one page of a room's players"""
+    try:
+        room_code = data.get('room_code')
+        page = max(int(data.get('page', 1)), 1)
+        per_page = min(max(int(data.get('per_page', 50)), 1), 200)
+        
+        roster = game_manager.get_roster(room_code, page, per_page) if room_code else None
+        if roster is None:
+            emit('room_error', {'message': 'Room not found'})
+            return
+        
+        emit('roster_page', roster)
+    
+    except Exception as e:
+        logger.error(f"Get roster error: {e}")
+        emit('room_error', {'message': 'Server error loading roster'})
+
 @socketio.on('next_round')
+@profiler.profile('next_round')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('next_round')
 def handle_next_round(data):
     """Handle next round"""
     try:
@@ -301,20 +725,29 @@ def handle_next_round(data):
         
         # Verify host
         room = game_manager.get_room(room_code)
-        if not room or room['host_sid'] != client_id:
+        if not room or room.host_sid != client_id:
             emit('round_error', {'message': 'Only host can advance rounds'})
             return
         
+        # Close a round the host skipped past so its answers score and players see their results
+        if room.current_question and not room.reveal:
+            game_manager.resolve_round(room_code)
+            send_player_results(room_code)
+            send_unlocks(room_code)
+        
         # Next round
         result = game_manager.next_round(room_code)
         
         if result.get('success'):
             if result.get('game_ended'):
                 logger.info(f"🏆 Game ended in room: {room_code}")
-                socketio.emit('game_ended', result, room=room_code)
+                outbound.emit_to_room('game_ended', result, room_code)
+                send_unlocks(room_code)
+                spectator_feed.mark_dirty(room_code)
             else:
                 logger.info(f"➡️ Next round in room: {room_code}")
-                socketio.emit('round_started', result, room=room_code)
+                outbound.emit_to_room('round_started', result, room_code)
+                spectator_feed.mark_dirty(room_code)
         else:
             emit('round_error', {'message': result.get('error', 'Failed to advance round')})
     
@@ -323,13 +756,21 @@ def handle_next_round(data):
         emit('round_error', {'message': 'Server error advancing round'})
 
 @socketio.on('leave_room')
+@profiler.profile('leave_room')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('leave_room')
 def handle_leave_room(data):
     """Handle leaving a room"""
     try:
         room_code = data.get('room_code')
         client_id = request.sid
         
-        if room_code and client_id in connected_clients:
+        if room_code and client_id in connected_clients and connected_clients[client_id].get('spectating') == room_code:
+            game_manager.remove_spectator(room_code, client_id)
+            leave_room(spectator_room(room_code))
+            connected_clients[client_id]['spectating'] = None
+            logger.info(f"👀 Spectator left room: {room_code}")
+        elif room_code and client_id in connected_clients:
             # Remove from game room
             result = game_manager.remove_player(room_code, client_id)
             
@@ -341,7 +782,10 @@ def handle_leave_room(data):
             
             if result.get('success') and not result.get('room_deleted'):
                 # Notify remaining players
-                socketio.emit('room_updated', result['room_data'], room=room_code)
+                broadcast_room_update(room_code, result['room_data'])
+                if result.get('round_ended'):
+                    announce_round_end(room_code, result['room_data'])
+                spectator_feed.mark_dirty(room_code)
             
             logger.info(f"🚪 Player left room: {room_code}")
     
@@ -349,6 +793,9 @@ def handle_leave_room(data):
         logger.error(f"Leave room error: {e}")
 
 @socketio.on('use_chaos_card')
+@profiler.profile('use_chaos_card')
+@latency_monitor.touch(lambda: request.sid)
+@payloads.validate('use_chaos_card')
 def handle_chaos_card(data):
     """Handle chaos card usage"""
     try:
@@ -356,16 +803,125 @@ def handle_chaos_card(data):
         card_type = data.get('card_type')
         client_id = request.sid
         
-        # Simple chaos card implementation
-        logger.info(f"⚡ Chaos card used: {card_type} in room: {room_code}")
+        if not room_code or not card_type:
+            emit('chaos_card_error', {'message': 'Room code and card type required'})
+            return
+        
+        result = game_manager.use_power_up(room_code, client_id, card_type)
+        
+        if not result.get('success'):
+            emit('chaos_card_error', {
+                'message': result.get('error', 'Failed to use card'),
+                'retry_after': result.get('retry_after')
+            })
+            return
+        
+        logger.info(f"⚡ Chaos card used: {result['card_type']} in room: {room_code}")
+        
+        # The player always gets their own effect; spy results stay private
+        emit('chaos_card_accepted', {
+            'card_type': result['card_type'],
+            'effect': result['effect'],
+            'tokens': result['tokens']
+        })
+        send_unlocks(room_code)
         
-        socketio.emit('chaos_card_used', {
-            'card_type': card_type,
-            'player_sid': client_id
-        }, room=room_code)
+        if result['broadcast']:
+            outbound.emit_to_room('chaos_card_used', {
+                'card_type': result['card_type'],
+                'player_sid': client_id,
+                'player_name': result['player_name'],
+                'effect': {} if result['card_type'] == 'spy_mode' else result['effect'],
+                'collapsed': result['collapsed']
+            }, room_code)
+            spectator_feed.mark_dirty(room_code)
     
     except Exception as e:
         logger.error(f"Chaos card error: {e}")
+        emit('chaos_card_error', {'message': 'Server error using card'})
+
+def release_client(client_id):
+    """Remove a client from its room and forget it"""
+    client = connected_clients.pop(client_id, None)
+    outbound.discard(client_id)
+    game_manager.achievements.forget(client_id)
+    if not client:
+        return
+    
+    room_code = client.get('room_code')
+    if room_code:
+        # Remove player from room
+        result = game_manager.remove_player(room_code, client_id)
+        if result.get('success') and not result.get('room_deleted'):
+            # Notify other players in the room
+            broadcast_room_update(room_code, result['room_data'])
+            if result.get('round_ended'):
+                announce_round_end(room_code, result['room_data'])
+            spectator_feed.mark_dirty(room_code)
+    
+    spectating = client.get('spectating')
+    if spectating:
+        game_manager.remove_spectator(spectating, client_id)
+        spectator_feed.mark_dirty(spectating)
+
+def evict_client(client_id):
+    """Drop a client whose heartbeat has lapsed"""
+    release_client(client_id)
+    try:
+        socketio.server.disconnect(client_id)
+    except Exception as e:
+        logger.error(f"Evict client error: {e}")
+
+def is_large_room(room_code):
+    """Whether a room uses aggregate-only broadcasts"""
+    room = game_manager.get_room(room_code)
+    return bool(room and room.is_large)
+
+def broadcast_room_update(room_code, room_data):
+    """Send room_updated to a room, coalesced per interval for large rooms"""
+    if is_large_room(room_code):
+        room_update_feed.start()
+        room_update_feed.mark_dirty(room_code)
+    else:
+        outbound.emit_to_room('room_updated', room_data, room_code)
+
+def announce_round_end(room_code, room_data):
+    """Tell a room its round closed and send each player their result"""
+    answer_progress_feed.discard(room_code)
+    outbound.emit_to_room('round_ended', {
+        'show_results': True,
+        'room_data': room_data,
+        'reveal': room_data.get('reveal')
+    }, room_code)
+    send_player_results(room_code)
+    send_unlocks(room_code)
+
+def send_player_results(room_code):
+    """Deliver each large-room player's round result to that player only"""
+    if not is_large_room(room_code):
+        return
+    
+    for player in game_manager.get_room(room_code).players:
+        player_result = game_manager.get_player_result(room_code, player.sid)
+        outbound.emit_to_client('your_result', player_result, player.sid)
+
+def send_unlocks(room_code):
+    """Announce achievements unlocked in a room since the last call"""
+    for unlock in game_manager.achievements.pop_unlocks(room_code):
+        logger.info(f"🏅 {unlock['player_name']} unlocked {unlock['achievement']['id']} in room: {room_code}")
+        outbound.emit_to_room('achievement_unlocked', unlock, room_code)
+
+def is_admin_request():
+    """Check the request's bearer token against ADMIN_TOKEN"""
+    if not ADMIN_TOKEN:
+        return False
+    header = request.headers.get('Authorization', '')
+    token = header[7:] if header.startswith('Bearer ') else request.headers.get('X-Admin-Token', '')
+    return hmac.compare_digest(token.encode('utf-8'), ADMIN_TOKEN.encode('utf-8'))
+
+def room_etag(room):
+    """Entity tag for a room snapshot"""
+    return f'{room.room_code}-{room.version}'
 
 # Error handlers
 @app.errorhandler(404)
@@ -383,8 +939,6 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
-    import time
-    
     # Get port from environment variable (for deployment)
     port = int(os.environ.get('PORT', 5000))
     
@@ -393,6 +947,9 @@ if __name__ == '__main__':
     logger.info(f"📁 Static folder: {app.static_folder}")
     logger.info(f"🎮 Questions loaded: {len(game_manager.questions)}")
     
+    # Hosting platforms stop the process with SIGTERM, which skips atexit by default
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
     # Run the server
     socketio.run(
         app, 
@@ -1,12 +1,21 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import validates
 
 db = SQLAlchemy()
 
+def normalize_email(email):
+    """Canonical stored form of an email; uniqueness is checked on this"""
+    return email.strip().lower()
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
 
+    @validates('email')
+    def validate_email(self, key, email):
+        return normalize_email(email) if isinstance(email, str) else email
+
     def __repr__(self):
         return f'<User {self.username}>'
 
@@ -0,0 +1,185 @@
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = '/'
+
+# Packets waiting in a client's transport queue before it counts as lagging
+MAX_TRANSPORT_BACKLOG = 32
+# Messages held per lagging client; the oldest are dropped beyond this, and a
+# client whose outbox is full of state transitions is disconnected to resync
+MAX_QUEUED_MESSAGES = 64
+# Seconds between attempts to flush held messages to lagging clients
+FLUSH_INTERVAL = 0.25
+
+# Snapshot events where only the newest copy matters to a client
+SUPERSEDABLE_EVENTS = frozenset({
+    'game_state_updated', 'room_updated', 'answer_progress', 'spectator_state'
+})
+# Game flow events a client cannot recover from missing; never dropped from an outbox
+STATE_TRANSITION_EVENTS = frozenset({
+    'game_started', 'round_started', 'answer_revealed', 'round_ended', 'game_ended',
+    'your_result', 'achievement_unlocked'
+})
+
+
+class OutboundQueues:
+    """Room broadcasts that hold back messages for slow clients.
+
+    The flush loop marks a client as lagging when its engine.io transport
+    queue is backed up. Lagging clients are skipped by room broadcasts and
+    their messages are held in a small per-client outbox instead. Snapshot
+    events replace any older copy of the same event type, other events are
+    kept in order up to a bound that drops non-transition events first, and
+    the outbox is flushed once the transport drains. A client whose outbox
+    holds nothing but state transitions at the bound is disconnected; the
+    client reconnects and rejoins with a fresh snapshot. While no client is
+    lagging a broadcast is a single emit with no scan of the room.
+    """
+
+    def __init__(self, socketio, max_backlog: int = MAX_TRANSPORT_BACKLOG,
+                 max_queued: int = MAX_QUEUED_MESSAGES, interval: float = FLUSH_INTERVAL):
+        self.socketio = socketio
+        self.max_backlog = max_backlog
+        self.max_queued = max_queued
+        self.interval = interval
+        self._outboxes: Dict[str, OrderedDict] = {}
+        # sids whose messages are being held; set by the flush loop
+        self._lagging: Set[str] = set()
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._started = False
+        self.stats = {
+            'direct': 0, 'held': 0, 'superseded': 0, 'dropped': 0, 'flushed': 0, 'overflowed': 0
+        }
+
+    def start(self) -> None:
+        """Start the flush loop once"""
+        if self._started:
+            return
+        self._started = True
+        self.socketio.start_background_task(self._run)
+
+    def emit_to_room(self, event: str, data, room: str) -> None:
+        """Broadcast to a room, holding the message for lagging members"""
+        if not self._lagging:
+            self.socketio.emit(event, data, to=room)
+            self.stats['direct'] += 1
+            return
+        members = self.socketio.server.manager.rooms.get(NAMESPACE, {}).get(room) or {}
+        lagging = [sid for sid in list(self._lagging) if sid in members]
+        if not lagging:
+            self.socketio.emit(event, data, to=room)
+            self.stats['direct'] += 1
+            return
+        if len(members) > len(lagging):
+            self.socketio.emit(event, data, to=room, skip_sid=lagging)
+            self.stats['direct'] += 1
+        for sid in lagging:
+            self._hold(sid, event, data)
+
+    def emit_to_client(self, event: str, data, sid: str) -> None:
+        """Send to one client unless it is lagging"""
+        if sid in self._lagging:
+            self._hold(sid, event, data)
+        else:
+            self.socketio.emit(event, data, to=sid)
+            self.stats['direct'] += 1
+
+    def discard(self, sid: str) -> None:
+        """Forget a disconnected client's outbox"""
+        with self._lock:
+            self._outboxes.pop(sid, None)
+            self._lagging.discard(sid)
+
+    def report(self) -> Dict:
+        with self._lock:
+            lagging = len(self._lagging)
+            queued = sum(len(outbox) for outbox in self._outboxes.values())
+        return dict(self.stats, lagging_clients=lagging, queued_messages=queued)
+
+    def _hold(self, sid: str, event: str, data) -> None:
+        with self._lock:
+            # Re-mark in case a flush finished between the caller's check and now
+            self._lagging.add(sid)
+            outbox = self._outboxes.setdefault(sid, OrderedDict())
+            if event in SUPERSEDABLE_EVENTS:
+                # Re-insert at the end so the newest snapshot follows any events before it
+                if outbox.pop(event, None) is not None:
+                    self.stats['superseded'] += 1
+                outbox[event] = (event, data)
+            else:
+                outbox[next(self._seq)] = (event, data)
+            self.stats['held'] += 1
+            overflowed = len(outbox) > self.max_queued and not self._drop_oldest(outbox)
+            if overflowed:
+                # Only transitions are left; the client is too far behind to catch up
+                self._outboxes.pop(sid, None)
+                self._lagging.discard(sid)
+                self.stats['overflowed'] += 1
+        if overflowed:
+            # Outside the lock: the disconnect handler calls discard()
+            logger.warning(f"Outbox overflow for {sid}, disconnecting")
+            self.socketio.server.disconnect(sid, namespace=NAMESPACE)
+
+    def _drop_oldest(self, outbox: OrderedDict) -> bool:
+        """Drop the oldest ordinary event, else the oldest snapshot; never a state transition"""
+        for droppable in (
+            lambda event: event not in STATE_TRANSITION_EVENTS and event not in SUPERSEDABLE_EVENTS,
+            lambda event: event in SUPERSEDABLE_EVENTS
+        ):
+            for key, (event, _) in outbox.items():
+                if droppable(event):
+                    del outbox[key]
+                    self.stats['dropped'] += 1
+                    return True
+        return False
+
+    def _run(self) -> None:
+        while True:
+            self.socketio.sleep(self.interval)
+            try:
+                self._mark_lagging()
+                self._flush()
+            except Exception as e:
+                logger.error(f"Outbound flush error: {e}")
+
+    def _mark_lagging(self) -> None:
+        """Start holding messages for clients whose transport queue is backed up"""
+        manager = self.socketio.server.manager
+        for eio_sid, socket in list(self.socketio.server.eio.sockets.items()):
+            if socket.queue.qsize() < self.max_backlog:
+                continue
+            sid = manager.sid_from_eio_sid(eio_sid, NAMESPACE)
+            if sid is not None and sid not in self._lagging:
+                with self._lock:
+                    self._lagging.add(sid)
+
+    def _flush(self) -> None:
+        with self._lock:
+            waiting = list(self._lagging)
+        for sid in waiting:
+            eio_sid = self._eio_sid(sid)
+            if eio_sid is None:
+                self.discard(sid)
+                continue
+            if self._backed_up(eio_sid):
+                continue
+            # Emit under the lock so messages held meanwhile cannot overtake the flush
+            with self._lock:
+                outbox = self._outboxes.pop(sid, None)
+                self._lagging.discard(sid)
+                for event, data in (outbox or {}).values():
+                    self.socketio.emit(event, data, to=sid)
+                    self.stats['flushed'] += 1
+
+    def _eio_sid(self, sid: str) -> Optional[str]:
+        return self.socketio.server.manager.eio_sid_from_sid(sid, NAMESPACE)
+
+    def _backed_up(self, eio_sid: Optional[str]) -> bool:
+        socket = self.socketio.server.eio.sockets.get(eio_sid) if eio_sid else None
+        return socket is not None and socket.queue.qsize() >= self.max_backlog
@@ -0,0 +1,181 @@
+"""Validation of inbound socket payloads.
+
+Each event has a small schema that is compiled once into a list of field
+checks. A payload is rejected before its handler runs if it is not an
+object, is larger than the event's byte budget, or has a field of the wrong
+type or size. Handlers receive a fresh dict with only the declared fields,
+so nothing the client adds beyond the schema is ever stored.
+"""
+import functools
+import logging
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Largest Socket.IO message the transport accepts, in bytes
+MAX_MESSAGE_BYTES = 16 * 1024
+# Default byte budget for one event payload
+DEFAULT_PAYLOAD_BYTES = 1024
+
+# Hard caps on stored strings; handlers still enforce the shorter display limits
+MAX_NAME_LENGTH = 64
+MAX_ROOM_CODE_LENGTH = 16
+MAX_ANSWER_TEXT_LENGTH = 200
+MAX_CARD_TYPE_LENGTH = 32
+MAX_HOST_TOKEN_LENGTH = 64
+
+
+class Field:
+    """Expected type and bounds of one payload field"""
+
+    __slots__ = ('types', 'max_length', 'minimum', 'maximum', 'schema')
+
+    def __init__(self, types, max_length: Optional[int] = None, minimum=None, maximum=None,
+                 schema: Optional[Dict[str, 'Field']] = None):
+        self.types = types if isinstance(types, tuple) else (types,)
+        self.max_length = max_length
+        self.minimum = minimum
+        self.maximum = maximum
+        self.schema = schema
+
+
+def _compile(schema: Dict[str, Field]) -> Callable[[Dict], Tuple[Optional[Dict], Optional[str]]]:
+    """Turn a schema into a function returning (clean payload, None) or (None, error)"""
+    checks = []
+    for name, field in schema.items():
+        nested = _compile(field.schema) if field.schema is not None else None
+        checks.append((name, field, nested))
+
+    def validate(data: Dict):
+        clean = {}
+        for name, field, nested in checks:
+            value = data.get(name)
+            if value is None:
+                continue
+            # bool is an int subclass; only accept it where bool is declared
+            if not isinstance(value, field.types) or (isinstance(value, bool) and bool not in field.types):
+                return None, f'{name} has the wrong type'
+            if field.max_length is not None and len(value) > field.max_length:
+                return None, f'{name} is too long'
+            if field.minimum is not None and value < field.minimum:
+                return None, f'{name} is too small'
+            if field.maximum is not None and value > field.maximum:
+                return None, f'{name} is too large'
+            if nested is not None:
+                value, error = nested(value)
+                if error:
+                    return None, f'{name}.{error}'
+            clean[name] = value
+        return clean, None
+
+    return validate
+
+
+def payload_size(value, budget: int) -> int:
+    """Approximate JSON size of a payload, stopping once it passes budget"""
+    size = 0
+    stack = [value]
+    while stack and size <= budget:
+        item = stack.pop()
+        if isinstance(item, str):
+            size += len(item) + 2
+        elif isinstance(item, dict):
+            size += 2
+            for key, child in item.items():
+                size += len(key) + 3 if isinstance(key, str) else 8
+                stack.append(child)
+        elif isinstance(item, (list, tuple)):
+            size += 2 + len(item)
+            stack.extend(item)
+        else:
+            size += 8
+    return size
+
+
+ROOM_CODE = Field(str, max_length=MAX_ROOM_CODE_LENGTH)
+NAME = Field(str, max_length=MAX_NAME_LENGTH)
+
+ROOM_ONLY = {'room_code': ROOM_CODE}
+
+# Settings a host may change when starting a game
+SETTINGS_SCHEMA = {
+    'chaos_cards': Field(bool),
+    'roast_mode': Field(bool),
+    'viral_clips': Field(bool),
+    'trending_topics': Field(bool)
+}
+
+ANSWER_SCHEMA = {
+    'answer_index': Field(int, minimum=0, maximum=63),
+    'answer_text': Field(str, max_length=MAX_ANSWER_TEXT_LENGTH)
+}
+
+EVENT_SCHEMAS: Dict[str, Dict[str, Field]] = {
+    'create_room': {'player_name': NAME, 'public': Field(bool), 'large_room': Field(bool)},
+    'join_room': {
+        'room_code': ROOM_CODE,
+        'player_name': NAME,
+        'host_token': Field(str, max_length=MAX_HOST_TOKEN_LENGTH)
+    },
+    'spectate_room': {'room_code': ROOM_CODE, 'name': NAME},
+    'quick_match': {'player_name': NAME},
+    'start_game': {'room_code': ROOM_CODE, 'settings': Field(dict, schema=SETTINGS_SCHEMA)},
+    'submit_answer': {'room_code': ROOM_CODE, 'answer_data': Field(dict, schema=ANSWER_SCHEMA)},
+    'reveal_answer': ROOM_ONLY,
+    'get_roster': {
+        'room_code': ROOM_CODE,
+        'page': Field(int, minimum=1, maximum=100_000),
+        'per_page': Field(int, minimum=1, maximum=200)
+    },
+    'next_round': ROOM_ONLY,
+    'leave_room': ROOM_ONLY,
+    'use_chaos_card': {'room_code': ROOM_CODE, 'card_type': Field(str, max_length=MAX_CARD_TYPE_LENGTH)}
+}
+
+# Events allowed a larger byte budget than DEFAULT_PAYLOAD_BYTES
+PAYLOAD_BYTES = {
+    'submit_answer': 2048
+}
+
+
+class PayloadGuard:
+    """Validates socket handler payloads and counts rejections per event.
+
+    Rejected payloads get a `payload_error` event with the event name and
+    reason, and the handler is not called.
+    """
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.rejected: Counter = Counter()
+        self._validators = {event: _compile(schema) for event, schema in EVENT_SCHEMAS.items()}
+
+    def validate(self, event: str):
+        """Decorator that replaces a handler's payload with its validated copy"""
+        validator = self._validators[event]
+        budget = PAYLOAD_BYTES.get(event, DEFAULT_PAYLOAD_BYTES)
+
+        def decorator(handler):
+            @functools.wraps(handler)
+            def wrapper(data=None):
+                if data is None:
+                    data = {}
+                if not isinstance(data, dict):
+                    return self._reject(event, 'payload must be an object')
+                if payload_size(data, budget) > budget:
+                    return self._reject(event, 'payload too large')
+                clean, error = validator(data)
+                if error:
+                    return self._reject(event, error)
+                return handler(clean)
+            return wrapper
+        return decorator
+
+    def report(self) -> Dict[str, int]:
+        return dict(self.rejected)
+
+    def _reject(self, event: str, reason: str) -> None:
+        self.rejected[event] += 1
+        logger.debug(f"🚫 Rejected {event} payload: {reason}")
+        self.emit('payload_error', {'event': event, 'message': reason})
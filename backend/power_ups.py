@@ -0,0 +1,176 @@
+import time
+from typing import Dict, Optional
+
+# Power-up catalog shared by the REST API and the effect engine
+POWER_UPS = [
+    {
+        "id": "double_down",
+        "name": "Double Down",
+        "icon": "2️⃣",
+        "description": "Double points for next prediction",
+        "cost": 1,
+        "type": "strategic"
+    },
+    {
+        "id": "spy_mode",
+        "name": "Spy Mode",
+        "icon": "👁️",
+        "description": "See other team's discussion for 30 seconds",
+        "cost": 2,
+        "type": "strategic"
+    },
+    {
+        "id": "steal",
+        "name": "Steal",
+        "icon": "💰",
+        "description": "Take the other team's points if they get it wrong",
+        "cost": 2,
+        "type": "strategic"
+    },
+    {
+        "id": "chaos_card",
+        "name": "Chaos Card",
+        "icon": "🎲",
+        "description": "Random effect that changes the game",
+        "cost": 1,
+        "type": "chaos"
+    },
+    {
+        "id": "time_freeze",
+        "name": "Time Freeze",
+        "icon": "⏰",
+        "description": "Get extra 30 seconds to discuss",
+        "cost": 1,
+        "type": "strategic"
+    },
+    {
+        "id": "meme_bomb",
+        "name": "Meme Bomb",
+        "icon": "💣",
+        "description": "Insert trending meme into current question",
+        "cost": 1,
+        "type": "chaos"
+    }
+]
+
+POWER_UPS_BY_ID = {power_up['id']: power_up for power_up in POWER_UPS}
+
+# Card names the client uses for catalog entries
+CARD_ALIASES = {
+    'double_points': 'double_down',
+    'steal_points': 'steal'
+}
+
+# Tokens a player starts a game with and earns each round
+STARTING_TOKENS = 3
+TOKENS_PER_ROUND = 1
+
+# Seconds before the same player can play the same card again
+PLAYER_COOLDOWN = 20.0
+# Seconds between any two cards in one room
+ROOM_COOLDOWN = 2.0
+# Repeats of the same card within this window share one broadcast
+COLLAPSE_WINDOW = 5.0
+
+TIME_FREEZE_SECONDS = 30
+STEAL_POINTS = 25
+
+
+class PowerUpEngine:
+    """Validates and applies power-ups against a room.
+
+    Cooldowns are last-use timestamps kept on the player and room, so each
+    check is a dict lookup. Effects that change scoring are stored on the
+    player and consumed when the round resolves.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+
+    def use(self, room, player, card_type: str) -> Dict:
+        card_id = CARD_ALIASES.get(card_type, card_type)
+        power_up = POWER_UPS_BY_ID.get(card_id)
+        if not power_up:
+            return {'success': False, 'error': 'Unknown card'}
+        if not room.settings.get('chaos_cards'):
+            return {'success': False, 'error': 'Chaos cards are disabled in this room'}
+        if not room.game_started or room.game_ended:
+            return {'success': False, 'error': 'Game is not in progress'}
+        if player.tokens < power_up['cost']:
+            return {'success': False, 'error': 'Not enough tokens'}
+
+        now = self.clock()
+        last_player_use = (player.card_used_at or {}).get(card_id)
+        if last_player_use is not None and now - last_player_use < PLAYER_COOLDOWN:
+            return {
+                'success': False,
+                'error': 'Card is on cooldown',
+                'retry_after': round(PLAYER_COOLDOWN - (now - last_player_use), 1)
+            }
+        log = room.card_log()
+        if now - log.last_at < ROOM_COOLDOWN:
+            return {
+                'success': False,
+                'error': 'Room card cooldown',
+                'retry_after': round(ROOM_COOLDOWN - (now - log.last_at), 1)
+            }
+
+        effect = self._apply(room, player, card_id)
+        if effect is None:
+            return {'success': False, 'error': 'Card cannot be played right now'}
+
+        player.tokens -= power_up['cost']
+        if player.card_used_at is None:
+            player.card_used_at = {}
+        player.card_used_at[card_id] = now
+        log.last_at = now
+        room.touch()
+
+        # Collapse repeats of the same card into the broadcast already sent
+        broadcast = True
+        if log.last_type == card_id and now - log.last_broadcast_at < COLLAPSE_WINDOW:
+            log.collapsed += 1
+            broadcast = False
+        else:
+            log.last_type = card_id
+            log.last_broadcast_at = now
+
+        result = {
+            'success': True,
+            'card_type': card_id,
+            'effect': effect,
+            'tokens': player.tokens,
+            'broadcast': broadcast
+        }
+        if broadcast:
+            result['collapsed'] = log.collapsed
+            log.collapsed = 0
+        return result
+
+    def _apply(self, room, player, card_id: str) -> Optional[Dict]:
+        if card_id == 'double_down':
+            if player.multiplier > 1:
+                return None
+            player.multiplier = 2
+            return {'multiplier': 2}
+        if card_id == 'steal':
+            if player.stealing:
+                return None
+            player.stealing = True
+            return {'steal_points': STEAL_POINTS}
+        if card_id == 'time_freeze':
+            if room.round_ends_at is None or room.reveal:
+                return None
+            room.round_ends_at += TIME_FREEZE_SECONDS
+            return {'round_ends_at': room.round_ends_at}
+        if card_id == 'spy_mode':
+            return {'option_histogram': list(room.option_histogram)}
+        # Chaos-type cards are cosmetic and only broadcast
+        return {}
+
+    def settle(self, player, points: int) -> int:
+        """Apply a stored multiplier to a player's round points and clear it"""
+        if player.multiplier > 1:
+            points *= player.multiplier
+            player.multiplier = 1
+        return points
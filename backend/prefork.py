@@ -0,0 +1,114 @@
+"""Prefork launcher for Roast Royale.
+
+The master process imports the app, Flask-SocketIO and the question bank
+once, freezes the GC so that long-lived objects are never touched again,
+binds the listening sockets and forks workers that share that memory
+copy-on-write.
+
+Each worker owns its own rooms and Socket.IO sessions, so workers cannot
+share a listening socket: worker i listens on PORT + i. With more than one
+worker, put a load balancer in front that keeps every request of a session
+(and every client of a room) on the same worker port.
+
+Usage: PORT=5000 WEB_CONCURRENCY=1 python backend/prefork.py
+"""
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+
+from werkzeug.serving import make_server
+
+from main import app, game_manager, handle_sigterm
+
+logger = logging.getLogger(__name__)
+
+
+def serve_worker(sock: socket.socket) -> None:
+    """Serve requests on the inherited listening socket until terminated"""
+    server = make_server(
+        sock.getsockname()[0],
+        sock.getsockname()[1],
+        app,
+        threaded=True,
+        fd=sock.fileno()
+    )
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    server.serve_forever()
+
+
+def spawn_worker(sock: socket.socket) -> int:
+    """Fork a worker for one listening socket and return its pid in the master.
+
+    The worker never returns: it flushes buffered achievement unlocks and
+    leaves through SystemExit so the interpreter shuts down normally.
+    """
+    pid = os.fork()
+    if pid == 0:
+        try:
+            serve_worker(sock)
+        finally:
+            game_manager.achievements.flush()
+        sys.exit(0)
+    return pid
+
+
+def bind(port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('0.0.0.0', port))
+    sock.listen(1024)
+    sock.set_inheritable(True)
+    return sock
+
+
+def main() -> None:
+    port = int(os.environ.get('PORT', 5000))
+    workers = max(int(os.environ.get('WEB_CONCURRENCY', 1)), 1)
+
+    # One socket per worker; a shared socket would spread a session's requests across workers
+    sockets = [bind(port + i) for i in range(workers)]
+
+    # Everything loaded so far is read-only for the life of the process;
+    # moving it to the permanent generation keeps GC passes in the workers
+    # from writing to (and so copying) the shared pages.
+    gc.collect()
+    gc.freeze()
+
+    logger.info(f"🔥 Prefork master {os.getpid()} with {workers} workers on ports {port}-{port + workers - 1}")
+    logger.info(f"🎮 Questions loaded: {len(game_manager.questions)}")
+
+    # pid -> listening socket of that worker
+    children = {spawn_worker(sock): sock for sock in sockets}
+    stopping = False
+
+    def shutdown(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        sock = children.pop(pid, None)
+        if not stopping and sock is not None:
+            logger.warning(f"⚠️ Worker {pid} exited, restarting")
+            children[spawn_worker(sock)] = sock
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+import functools
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between stack samples while a profiled event is running
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# Deepest stack kept per sample; deeper frames are cut at the root end
+MAX_STACK_DEPTH = 64
+# Distinct stacks kept per event; further new stacks are counted as truncated
+MAX_STACKS_PER_EVENT = 5000
+
+
+class EventProfiler:
+    """Statistical profiler for socket event handlers.
+
+    Disabled by default. When enabled, each handler call is picked for
+    profiling with probability `sample_rate`; while picked calls are running a
+    sampler thread snapshots their stacks every `interval` seconds and folds
+    them into per-event counts ("outer;inner count", the input format of
+    flamegraph tools). Disabled, a wrapped handler costs one attribute check.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.interval = DEFAULT_SAMPLE_INTERVAL
+        self.rng = rng or random.Random()
+        self._lock = threading.Lock()
+        # thread id -> event names of the profiled calls running on it, innermost last
+        self._active: Dict[int, List[str]] = {}
+        self._stacks: Dict[str, Counter] = {}
+        self._calls: Counter = Counter()
+        self._seconds: Counter = Counter()
+        self._truncated: Counter = Counter()
+        self._sampler: Optional[threading.Thread] = None
+
+    def configure(self, enabled: bool, sample_rate: Optional[float] = None,
+                  interval: Optional[float] = None) -> None:
+        # bool("false") is True, so only a real bool may switch profiling on or off
+        if not isinstance(enabled, bool):
+            raise TypeError('enabled must be true or false')
+        if sample_rate is not None:
+            self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        if interval is not None:
+            self.interval = max(float(interval), 0.001)
+        self.enabled = enabled
+        if self.enabled and (self._sampler is None or not self._sampler.is_alive()):
+            self._sampler = threading.Thread(target=self._run, name='event-profiler', daemon=True)
+            self._sampler.start()
+        logger.info(f"🔬 Profiling {'enabled' if self.enabled else 'disabled'} "
+                    f"(sample_rate={self.sample_rate}, interval={self.interval}s)")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stacks.clear()
+            self._calls.clear()
+            self._seconds.clear()
+            self._truncated.clear()
+
+    def profile(self, event: str):
+        """Decorator that samples calls of a socket handler under `event`"""
+        def decorator(handler):
+            @functools.wraps(handler)
+            def wrapper(*args, **kwargs):
+                if not self.enabled or self.rng.random() >= self.sample_rate:
+                    return handler(*args, **kwargs)
+                thread_id = threading.get_ident()
+                started = time.perf_counter()
+                # Handlers call each other (quick_match -> join_room), so keep a stack per thread
+                stack = self._active.setdefault(thread_id, [])
+                stack.append(event)
+                try:
+                    return handler(*args, **kwargs)
+                finally:
+                    stack.pop()
+                    if not stack:
+                        self._active.pop(thread_id, None)
+                    with self._lock:
+                        self._calls[event] += 1
+                        self._seconds[event] += time.perf_counter() - started
+            return wrapper
+        return decorator
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while self.enabled:
+            time.sleep(self.interval)
+            if not self._active:
+                continue
+            frames = sys._current_frames()
+            for thread_id, stack in list(self._active.items()):
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own_id:
+                    continue
+                try:
+                    event = stack[-1]
+                except IndexError:
+                    # The call finished after the copy
+                    continue
+                self._record(event, _fold(frame))
+
+    def _record(self, event: str, stack: str) -> None:
+        with self._lock:
+            stacks = self._stacks.setdefault(event, Counter())
+            if stack in stacks or len(stacks) < MAX_STACKS_PER_EVENT:
+                stacks[stack] += 1
+            else:
+                self._truncated[event] += 1
+
+    def folded(self, event: Optional[str] = None) -> str:
+        """Folded stacks for one event or all, prefixed with the event name"""
+        with self._lock:
+            lines = [
+                f'{name};{stack} {count}'
+                for name, stacks in self._stacks.items() if event is None or name == event
+                for stack, count in stacks.items()
+            ]
+        return '\n'.join(lines) + ('\n' if lines else '')
+
+    def report(self, top: int = 20) -> Dict:
+        with self._lock:
+            events = {}
+            for name, calls in self._calls.items():
+                stacks = self._stacks.get(name, Counter())
+                events[name] = {
+                    'profiled_calls': calls,
+                    'avg_ms': round(self._seconds[name] / calls * 1000, 3),
+                    'samples': sum(stacks.values()),
+                    'truncated_samples': self._truncated[name],
+                    'top_stacks': [
+                        {'stack': stack, 'samples': count}
+                        for stack, count in stacks.most_common(top)
+                    ]
+                }
+        return {
+            'enabled': self.enabled,
+            'sample_rate': self.sample_rate,
+            'interval': self.interval,
+            'events': events
+        }
+
+
+def _fold(frame) -> str:
+    """Render a frame's stack root-first as 'func (file);...'"""
+    parts = []
+    while frame is not None and len(parts) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        parts.append(f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]})')
+        frame = frame.f_back
+    parts.reverse()
+    return ';'.join(parts)
@@ -0,0 +1,70 @@
+"""Compact on-disk question bank.
+
+Layout (native byte order, little-endian on all supported hosts):
+
+    MAGIC (8 bytes) | count (uint64) | offsets (count + 1 uint64) | records
+
+Each record is a compact JSON object; question i occupies
+records[offsets[i]:offsets[i + 1]]. The file is memory-mapped and the offset
+table is read in place, so opening a bank of any size is O(1) and questions
+are decoded only when they are picked.
+"""
+import json
+import mmap
+import struct
+from array import array
+from typing import Dict, Iterable, List
+
+MAGIC = b'RRQBANK1'
+_HEADER = struct.Struct('=8sQ')
+
+
+class QuestionBank:
+    """Read-only, memory-mapped sequence of questions"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a question bank file')
+        table_end = _HEADER.size + 8 * (self._count + 1)
+        self._offsets = memoryview(self._mmap)[_HEADER.size:table_end].cast('Q')
+        self._records_start = table_end
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('question index out of range')
+        start = self._records_start + self._offsets[index]
+        end = self._records_start + self._offsets[index + 1]
+        return json.loads(self._mmap[start:end])
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self[i]
+
+
+def write_question_bank(path: str, questions: Iterable[Dict]) -> int:
+    """Write questions to a bank file and return how many were written"""
+    records: List[bytes] = [
+        json.dumps(q, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        for q in questions
+    ]
+    offsets = array('Q', [0])
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(records)))
+        f.write(offsets.tobytes())
+        for record in records:
+            f.write(record)
+    return len(records)
@@ -0,0 +1,325 @@
+import heapq
+import json
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+from clips import EventRing
+
+# Number of players shown on a large room's leaderboard
+LEADERBOARD_SIZE = 10
+
+# Seconds players get to answer each round
+ROUND_SECONDS = 60
+
+# Settings every new room starts with, shared per (public, large_room) variant
+_DEFAULT_SETTINGS: Dict[tuple, Dict] = {}
+
+
+def default_settings(public: bool = False, large_room: bool = False) -> Dict:
+    """Shared default settings dict; rooms replace it rather than mutate it"""
+    key = (bool(public), bool(large_room))
+    settings = _DEFAULT_SETTINGS.get(key)
+    if settings is None:
+        settings = _DEFAULT_SETTINGS[key] = {
+            'chaos_cards': True,
+            'roast_mode': True,
+            'viral_clips': True,
+            'trending_topics': True,
+            'public': key[0],
+            'large_room': key[1]
+        }
+    return settings
+
+
+def settings_size(settings: Dict) -> int:
+    """Approximate bytes held by one settings dict"""
+    return sys.getsizeof(settings) + sum(
+        sys.getsizeof(key) + sys.getsizeof(value) for key, value in settings.items()
+    )
+
+
+class Player:
+    """A seated player. Only the answer fields scoring needs are kept."""
+
+    __slots__ = (
+        'name', 'sid', 'is_host', 'score', 'answered', 'answer_index', 'answer_text', 'last_match',
+        'tokens', 'multiplier', 'stealing', 'card_used_at', 'response_time', 'round_start_score'
+    )
+
+    def __init__(self, name: str, sid: str, is_host: bool = False):
+        self.name = name
+        self.sid = sid
+        self.is_host = is_host
+        self.score = 0
+        self.answered = False
+        self.answer_index: Optional[int] = None
+        self.answer_text: Optional[str] = None
+        self.last_match: Optional[Dict] = None
+        self.tokens = 0
+        self.multiplier = 1
+        self.stealing = False
+        self.card_used_at: Optional[Dict[str, float]] = None
+        self.response_time: Optional[float] = None
+        # Score when the current round began, so the round's full gain is known
+        self.round_start_score = 0
+
+    def to_wire(self) -> Dict:
+        return {
+            'name': self.name,
+            'sid': self.sid,
+            'is_host': self.is_host,
+            'score': self.score,
+            'answered': self.answered,
+            'tokens': self.tokens
+        }
+
+
+class CardLog:
+    """Room-wide card cooldown and collapse state, created on the first card played"""
+
+    __slots__ = ('last_at', 'last_type', 'last_broadcast_at', 'collapsed')
+
+    def __init__(self):
+        self.last_at = float('-inf')
+        self.last_type: Optional[str] = None
+        self.last_broadcast_at = float('-inf')
+        self.collapsed = 0
+
+
+class Room:
+    """Game room state with a versioned, cached wire form.
+
+    Every mutation goes through a method that bumps `version`; `to_wire()`
+    rebuilds the serialized dict only when the version has moved, so repeated
+    broadcasts of an unchanged room reuse the same object. Lobbies change on
+    almost every event and sit idle in bulk, so they keep no cached copy.
+
+    Idle rooms are kept small: settings are shared between rooms until one
+    changes them (see update_settings), and per-game state such as the card
+    log is only allocated once it is used.
+    """
+
+    __slots__ = (
+        'room_code', 'host_sid', 'players', 'players_by_sid', 'game_started', 'game_ended',
+        'current_round', 'total_rounds', 'max_players', 'current_question', 'answered_count',
+        'option_histogram', 'settings', 'created_at', 'reveal', 'round_scores', 'version',
+        'round_started_at', 'round_ends_at', 'cards', 'events', 'clock', 'deck', 'host_token',
+        '_cache_version', '_wire', '_json', '_leaderboard'
+    )
+
+    def __init__(self, room_code: str, host: Optional[Player], max_players: int, settings: Dict,
+                 clock=time.time):
+        self.clock = clock
+        self.room_code = room_code
+        # Provisioned rooms start empty and get a host when someone claims it
+        self.host_sid = host.sid if host else None
+        self.players: List[Player] = [host] if host else []
+        self.players_by_sid: Dict[str, Player] = {host.sid: host} if host else {}
+        self.game_started = False
+        self.game_ended = False
+        self.current_round = 0
+        self.total_rounds = 5
+        self.max_players = max_players
+        self.current_question: Optional[Dict] = None
+        self.answered_count = 0
+        # Replaced by a list when the first round starts
+        self.option_histogram: Sequence[int] = ()
+        # May be shared with other rooms; never mutate in place
+        self.settings = settings
+        self.created_at = clock()
+        self.reveal: Optional[Dict] = None
+        self.round_scores: Optional[Dict[str, int]] = None
+        self.round_started_at: Optional[float] = None
+        self.round_ends_at: Optional[float] = None
+        self.cards: Optional[CardLog] = None
+        self.events: Optional[EventRing] = None
+        self.sync_clip_setting()
+        # Shared question subset for provisioned rooms; None means the full bank
+        self.deck: Optional[List[Dict]] = None
+        self.host_token: Optional[str] = None
+        self.version = 0
+        # Version the cached wire form (and its JSON, once encoded) belongs to
+        self._cache_version = -1
+        self._wire: Optional[Dict] = None
+        self._json: Optional[str] = None
+        self._leaderboard: Optional[List[Dict]] = None
+
+    @property
+    def is_large(self) -> bool:
+        return bool(self.settings.get('large_room'))
+
+    def update_settings(self, changes: Dict) -> None:
+        """Apply setting changes, copying the possibly shared settings dict first"""
+        if any(self.settings.get(key) != value for key, value in changes.items()):
+            self.settings = {**self.settings, **changes}
+            self.touch()
+        self.sync_clip_setting()
+
+    def card_log(self) -> CardLog:
+        if self.cards is None:
+            self.cards = CardLog()
+        return self.cards
+
+    def sync_clip_setting(self) -> None:
+        """Drop the event ring once viral clips are turned off"""
+        if not self.settings.get('viral_clips'):
+            self.events = None
+
+    def record_event(self, kind: str, actor: Optional[str] = None, data=None) -> None:
+        """Append to the viral clip buffer when clips are enabled.
+
+        The ring is created by the first event, so lobbies that never start
+        a game do not carry one.
+        """
+        if self.events is None:
+            if not self.settings.get('viral_clips'):
+                return
+            self.events = EventRing(clock=self.clock)
+        self.events.record(kind, actor, data)
+
+    def touch(self) -> None:
+        """Record a mutation so the cached wire form is rebuilt"""
+        self.version += 1
+
+    def add_player(self, player: Player) -> None:
+        self.players.append(player)
+        self.players_by_sid[player.sid] = player
+        self._leaderboard = None
+        self.touch()
+
+    def remove_player(self, sid: str) -> Optional[Player]:
+        player = self.players_by_sid.pop(sid, None)
+        if player is None:
+            return None
+        self.players.remove(player)
+        if player.answered:
+            self.answered_count -= 1
+            if player.answer_index is not None:
+                self.option_histogram[player.answer_index] -= 1
+        if player.is_host and self.players:
+            self.players[0].is_host = True
+            self.host_sid = self.players[0].sid
+        self._leaderboard = None
+        self.touch()
+        return player
+
+    def claim_host(self, player: Player) -> None:
+        """Make a player the host, consuming the room's host token"""
+        for other in self.players:
+            other.is_host = False
+        player.is_host = True
+        self.host_sid = player.sid
+        self.host_token = None
+        self.touch()
+
+    def reset_round(self, question: Dict) -> None:
+        self.current_question = question
+        self.round_started_at = self.clock()
+        self.round_ends_at = self.round_started_at + ROUND_SECONDS
+        self.reveal = None
+        self.round_scores = None
+        self.answered_count = 0
+        self.option_histogram = [0] * len(question.get('options', []))
+        for player in self.players:
+            player.answered = False
+            player.answer_index = None
+            player.answer_text = None
+            player.last_match = None
+            player.response_time = None
+            player.round_start_score = player.score
+        self.touch()
+
+    def record_answer(self, player: Player, answer_index, answer_text,
+                      response_time: Optional[float] = None) -> None:
+        player.answered = True
+        player.response_time = response_time
+        self.answered_count += 1
+        if isinstance(answer_index, int) and 0 <= answer_index < len(self.option_histogram):
+            player.answer_index = answer_index
+            self.option_histogram[answer_index] += 1
+        if isinstance(answer_text, str):
+            player.answer_text = answer_text
+        self.touch()
+
+    def award(self, player: Player, points: int) -> None:
+        player.score += points
+        self._leaderboard = None
+        self.touch()
+
+    def leaderboard(self) -> List[Dict]:
+        """Top-N players by score, cached until scores or the roster change"""
+        if self._leaderboard is None:
+            top = heapq.nlargest(LEADERBOARD_SIZE, self.players, key=lambda p: p.score)
+            self._leaderboard = [{'name': p.name, 'score': p.score} for p in top]
+        return self._leaderboard
+
+    def scores(self) -> Dict[str, int]:
+        return {p.sid: p.score for p in self.players}
+
+    def to_wire(self) -> Dict:
+        """Serialized room as broadcast to players, rebuilt only after a mutation.
+
+        Large rooms drop the full roster and score map in favour of counts and
+        the top-N leaderboard; players page through the roster instead.
+        """
+        if self._cache_version == self.version:
+            return self._wire
+
+        wire = {
+            'room_code': self.room_code,
+            'host_sid': self.host_sid,
+            'game_started': self.game_started,
+            'current_round': self.current_round,
+            'total_rounds': self.total_rounds,
+            'max_players': self.max_players,
+            'current_question': self.current_question,
+            'answered_count': self.answered_count,
+            'option_histogram': self.option_histogram,
+            'settings': self.settings,
+            'created_at': self.created_at,
+            'reveal': self.reveal,
+            'round_ends_at': self.round_ends_at,
+            'version': self.version
+        }
+        if self.game_ended:
+            wire['game_ended'] = True
+        if self.is_large:
+            wire['player_count'] = len(self.players)
+            wire['leaderboard'] = self.leaderboard()
+        else:
+            wire['players'] = [p.to_wire() for p in self.players]
+            wire['scores'] = self.scores()
+
+        if self.game_started:
+            self._cache_version = self.version
+            self._wire = wire
+            self._json = None
+        return wire
+
+    def to_json(self) -> str:
+        """JSON-encoded wire form, cached per version for polling clients"""
+        wire = self.to_wire()
+        if self._cache_version == self.version and self._json is not None:
+            return self._json
+        encoded = json.dumps(wire, separators=(',', ':'))
+        if self._cache_version == self.version:
+            self._json = encoded
+        return encoded
+
+    def memory_size(self) -> int:
+        """Approximate bytes held by this room, excluding shared question data and settings"""
+        size = sys.getsizeof(self) + sys.getsizeof(self.players) + sys.getsizeof(self.players_by_sid)
+        size += sys.getsizeof(self.option_histogram) if self.option_histogram else 0
+        if self.cards is not None:
+            size += sys.getsizeof(self.cards)
+        if self.events is not None:
+            size += self.events.memory_size()
+        for player in self.players:
+            size += sys.getsizeof(player) + sys.getsizeof(player.name) + sys.getsizeof(player.sid)
+            if player.answer_text is not None:
+                size += sys.getsizeof(player.answer_text)
+        if self._wire is not None:
+            size += sys.getsizeof(self._wire)
+        if self._json is not None:
+            size += sys.getsizeof(self._json)
+        return size
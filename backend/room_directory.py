@@ -0,0 +1,150 @@
+import heapq
+import itertools
+from typing import Dict, List, Optional
+
+
+class SeatBucket:
+    """Room codes with the same number of open seats, indexable for slicing.
+
+    Removal swaps the last code into the freed slot, so it is O(1) at the
+    cost of order within the bucket.
+    """
+
+    __slots__ = ('codes', 'positions')
+
+    def __init__(self):
+        self.codes: List[str] = []
+        self.positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def add(self, room_code: str) -> None:
+        self.positions[room_code] = len(self.codes)
+        self.codes.append(room_code)
+
+    def remove(self, room_code: str) -> None:
+        position = self.positions.pop(room_code)
+        last = self.codes.pop()
+        if last != room_code:
+            self.codes[position] = last
+            self.positions[last] = position
+
+
+class RoomDirectory:
+    """Incrementally maintained index of public rooms.
+
+    Rooms are grouped by state and then bucketed by open seats, fullest
+    first, so a page is found by skipping whole buckets and slicing one; its
+    cost depends on the page size and seat range, not on the offset. Joinable
+    rooms are also kept in a max-heap on player count so quick match finds
+    the fullest open room in O(log n). Heap entries are invalidated lazily
+    when a room changes.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict] = {}
+        # state -> open seats -> bucket of room codes
+        self._by_state: Dict[str, Dict[int, SeatBucket]] = {}
+        self._open_heap: List = []
+        self._heap_tokens: Dict[str, int] = {}
+        self._counter = itertools.count()
+
+    def update(self, room) -> None:
+        """Add or refresh a room after it is created or mutated"""
+        room_code = room.room_code
+        if not room.settings.get('public'):
+            self.remove(room_code)
+            return
+
+        if room.game_ended:
+            state = 'finished'
+        elif room.game_started:
+            state = 'in_game'
+        else:
+            state = 'waiting'
+
+        previous = self._entries.get(room_code)
+        if previous:
+            self._unlist(previous)
+
+        player_count = len(room.players)
+        entry = {
+            'room_code': room_code,
+            'host_name': room.players[0].name if room.players else None,
+            'players': player_count,
+            'max_players': room.max_players,
+            'open_seats': room.max_players - player_count,
+            'state': state,
+            'created_at': room.created_at
+        }
+        self._entries[room_code] = entry
+        buckets = self._by_state.setdefault(state, {})
+        bucket = buckets.get(entry['open_seats'])
+        if bucket is None:
+            bucket = buckets[entry['open_seats']] = SeatBucket()
+        bucket.add(room_code)
+
+        # Provisioned rooms wait for the host holding their token, so quick match skips them
+        if state == 'waiting' and entry['open_seats'] > 0 and room.host_sid is not None:
+            token = next(self._counter)
+            self._heap_tokens[room_code] = token
+            heapq.heappush(self._open_heap, (-player_count, token, room_code))
+            self._compact()
+        else:
+            self._heap_tokens.pop(room_code, None)
+
+    def remove(self, room_code: str) -> None:
+        """Drop a room from the directory"""
+        entry = self._entries.pop(room_code, None)
+        if entry:
+            self._unlist(entry)
+        self._heap_tokens.pop(room_code, None)
+
+    def _unlist(self, entry: Dict) -> None:
+        buckets = self._by_state[entry['state']]
+        bucket = buckets[entry['open_seats']]
+        bucket.remove(entry['room_code'])
+        if not bucket:
+            del buckets[entry['open_seats']]
+
+    def fullest_open(self) -> Optional[str]:
+        """Return the code of the joinable public room with the most players"""
+        while self._open_heap:
+            _, token, room_code = self._open_heap[0]
+            if self._heap_tokens.get(room_code) == token:
+                return room_code
+            heapq.heappop(self._open_heap)
+        return None
+
+    def list_rooms(self, state: str = 'waiting', page: int = 1, per_page: int = 20) -> Dict:
+        """Return one page of public rooms in the given state, fewest open seats first"""
+        buckets = self._by_state.get(state, {})
+        skip = (page - 1) * per_page
+        total = 0
+        page_codes: List[str] = []
+        for open_seats in sorted(buckets):
+            bucket = buckets[open_seats]
+            total += len(bucket)
+            if len(page_codes) >= per_page:
+                continue
+            if skip >= len(bucket):
+                skip -= len(bucket)
+                continue
+            page_codes.extend(bucket.codes[skip:skip + per_page - len(page_codes)])
+            skip = 0
+        return {
+            'rooms': [self._entries[code] for code in page_codes],
+            'page': page,
+            'per_page': per_page,
+            'total': total
+        }
+
+    def _compact(self) -> None:
+        """Rebuild the heap once stale entries outnumber live ones"""
+        if len(self._open_heap) > 2 * len(self._heap_tokens) + 64:
+            self._open_heap = [
+                item for item in self._open_heap
+                if self._heap_tokens.get(item[2]) == item[1]
+            ]
+            heapq.heapify(self._open_heap)
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 import json
 import os
+from achievements import ACHIEVEMENTS
+from answer_matcher import build_answer_matchers
+from power_ups import POWER_UPS
 
 game_bp = Blueprint('game', __name__)
 
@@ -91,6 +94,10 @@ def load_questions():
     ]
     return questions
 
+# Question bank and answer indexes are built once at import
+QUESTIONS = load_questions()
+ANSWER_MATCHERS = build_answer_matchers(QUESTIONS)
+
 @game_bp.route('/questions', methods=['GET'])
 def get_questions():
     """Get all available questions"""
@@ -108,6 +115,21 @@ def get_question(question_id):
     else:
         return jsonify({"error": "Question not found"}), 404
 
+@game_bp.route('/questions/<int:question_id>/guess', methods=['POST'])
+def check_guess(question_id):
+    """Match a free-text guess against a question's answer board"""
+    matcher = ANSWER_MATCHERS.get(question_id)
+    if not matcher:
+        return jsonify({"error": "Question has no answer board"}), 404
+
+    data = request.get_json(silent=True) or {}
+    guess = data.get('guess', '')
+    if not isinstance(guess, str) or not guess.strip():
+        return jsonify({"error": "Guess required"}), 400
+
+    match = matcher.match(guess)
+    return jsonify({"matched": match is not None, "answer": match})
+
 @game_bp.route('/questions/random', methods=['GET'])
 def get_random_question():
     """Get a random question"""
@@ -126,96 +148,12 @@ def get_questions_by_category(category):
 @game_bp.route('/power-ups', methods=['GET'])
 def get_power_ups():
     """Get all available power-ups"""
-    power_ups = [
-        {
-            "id": "double_down",
-            "name": "Double Down",
-            "icon": "2️⃣",
-            "description": "Double points for next prediction",
-            "cost": 1,
-            "type": "strategic"
-        },
-        {
-            "id": "spy_mode",
-            "name": "Spy Mode",
-            "icon": "👁️",
-            "description": "See other team's discussion for 30 seconds",
-            "cost": 2,
-            "type": "strategic"
-        },
-        {
-            "id": "steal",
-            "name": "Steal",
-            "icon": "💰",
-            "description": "Take the other team's points if they get it wrong",
-            "cost": 2,
-            "type": "strategic"
-        },
-        {
-            "id": "chaos_card",
-            "name": "Chaos Card",
-            "icon": "🎲",
-            "description": "Random effect that changes the game",
-            "cost": 1,
-            "type": "chaos"
-        },
-        {
-            "id": "time_freeze",
-            "name": "Time Freeze",
-            "icon": "⏰",
-            "description": "Get extra 30 seconds to discuss",
-            "cost": 1,
-            "type": "strategic"
-        },
-        {
-            "id": "meme_bomb",
-            "name": "Meme Bomb",
-            "icon": "💣",
-            "description": "Insert trending meme into current question",
-            "cost": 1,
-            "type": "chaos"
-        }
-    ]
-    return jsonify({"power_ups": power_ups})
+    return jsonify({"power_ups": POWER_UPS})
 
 @game_bp.route('/achievements', methods=['GET'])
 def get_achievements():
     """Get all available achievements"""
-    achievements = [
-        {
-            "id": "mind_reader",
-            "name": "Mind Reader",
-            "description": "Predict 10 #1 answers in a row",
-            "icon": "🧠",
-            "rarity": "rare",
-            "points": 100
-        },
-        {
-            "id": "friendship_destroyer",
-            "name": "Friendship Destroyer",
-            "description": "Cause 10 arguments in friend group",
-            "icon": "💀",
-            "rarity": "epic",
-            "points": 200
-        },
-        {
-            "id": "meme_lord",
-            "name": "Meme Lord",
-            "description": "Create 25 viral moments",
-            "icon": "👑",
-            "rarity": "legendary",
-            "points": 500
-        },
-        {
-            "id": "clutch_player",
-            "name": "Clutch Player",
-            "description": "Win 5 games in final round",
-            "icon": "🔥",
-            "rarity": "rare",
-            "points": 150
-        }
-    ]
-    return jsonify({"achievements": achievements})
+    return jsonify({"achievements": ACHIEVEMENTS})
 
 @game_bp.route('/leaderboard', methods=['GET'])
 def get_leaderboard():
@@ -1,8 +1,91 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
 from flask import Blueprint, jsonify, request
-from src.models.user import User, db
+from sqlalchemy import insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from models.user import User, db, normalize_email
 
 user_bp = Blueprint('user', __name__)
 
+# Rows per executemany transaction for bulk imports
+BULK_BATCH_SIZE = 1000
+
+class UserCache:
+    """Bounded LRU/TTL cache of serialized users keyed by id, with a username index"""
+
+    def __init__(self, max_size=5000, ttl=300, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # user_id -> (expires_at, user_dict)
+        self._ids_by_username = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None or entry[0] < self.clock():
+                if entry is not None:
+                    self._evict(user_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+
+    def get_by_username(self, username):
+        user_id = self._ids_by_username.get(username)
+        if user_id is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        return self.get(user_id)
+
+    def put(self, user_dict):
+        with self._lock:
+            user_id = user_dict['id']
+            if user_id in self._entries:
+                self._evict(user_id)
+            self._entries[user_id] = (self.clock() + self.ttl, user_dict)
+            self._ids_by_username[user_dict['username']] = user_id
+            while len(self._entries) > self.max_size:
+                self._evict(next(iter(self._entries)))
+
+    def invalidate(self, user_id):
+        with self._lock:
+            if user_id in self._entries:
+                self._evict(user_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._ids_by_username.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0
+        }
+
+    def _evict(self, user_id):
+        _, user_dict = self._entries.pop(user_id)
+        if self._ids_by_username.get(user_dict['username']) == user_id:
+            del self._ids_by_username[user_dict['username']]
+
+user_cache = UserCache()
+
 @user_bp.route('/users', methods=['GET'])
 def get_users():
     users = User.query.all()
@@ -10,17 +93,192 @@ def get_users():
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
-    
+
     data = request.json
     user = User(username=data['username'], email=data['email'])
     db.session.add(user)
     db.session.commit()
     return jsonify(user.to_dict()), 201
 
+@user_bp.route('/users/bulk', methods=['POST'])
+def bulk_import_users():
+    """Insert or upsert many users from a JSON array or an NDJSON stream.
+
+    Rows are validated and deduplicated on username/email, then written in
+    batched executemany transactions. Pass ``?mode=upsert`` to update the
+    email of existing usernames instead of reporting them as errors.
+    """
+    mode = request.args.get('mode', 'insert')
+    if mode not in ('insert', 'upsert'):
+        return jsonify({'error': 'mode must be insert or upsert'}), 400
+
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        rows = _iter_ndjson(request.stream)
+    else:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list):
+            return jsonify({'error': 'Expected a JSON array of users'}), 400
+        rows = enumerate(data)
+
+    result = {'inserted': 0, 'updated': 0, 'errors': []}
+    seen_usernames = set()
+    seen_emails = set()
+    batch = []
+
+    for index, row in rows:
+        error = _validate_user_row(row)
+        if error:
+            result['errors'].append({'row': index, 'error': error})
+            continue
+
+        username = row['username'].strip()
+        email = normalize_email(row['email'])
+        if username in seen_usernames:
+            result['errors'].append({'row': index, 'error': 'Duplicate username in payload'})
+            continue
+        if email in seen_emails:
+            result['errors'].append({'row': index, 'error': 'Duplicate email in payload'})
+            continue
+        seen_usernames.add(username)
+        seen_emails.add(email)
+
+        batch.append((index, username, email))
+        if len(batch) >= BULK_BATCH_SIZE:
+            _write_user_batch(batch, mode, result)
+            batch = []
+
+    if batch:
+        _write_user_batch(batch, mode, result)
+
+    return jsonify(result), 200
+
+def _iter_ndjson(stream):
+    """Yield (row_number, parsed_object) pairs from an NDJSON byte stream"""
+    for index, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield index, json.loads(line)
+        except ValueError:
+            yield index, None
+
+def _validate_user_row(row):
+    """Return an error message for an invalid import row, or None"""
+    if not isinstance(row, dict):
+        return 'Row must be a JSON object'
+    username = row.get('username')
+    email = row.get('email')
+    if not isinstance(username, str) or not username.strip():
+        return 'username is required'
+    if not isinstance(email, str) or '@' not in email:
+        return 'A valid email is required'
+    if len(username.strip()) > 80:
+        return 'username is too long'
+    if len(email.strip()) > 120:
+        return 'email is too long'
+    return None
+
+def _write_user_batch(batch, mode, result):
+    """Resolve conflicts against the database and write one batch in a single transaction"""
+    usernames = [username for _, username, _ in batch]
+    emails = [email for _, _, email in batch]
+    existing = db.session.execute(
+        db.select(User.id, User.username, User.email).where(
+            or_(User.username.in_(usernames), User.email.in_(emails))
+        )
+    ).all()
+    id_by_username = {row.username: row.id for row in existing}
+    username_by_email = {row.email: row.username for row in existing}
+
+    inserts = []
+    updates = []
+    written = []  # (row index, insert or update params)
+    for index, username, email in batch:
+        owner = username_by_email.get(email)
+        if owner is not None and owner != username:
+            result['errors'].append({'row': index, 'error': 'Email already in use'})
+            continue
+        if username in id_by_username:
+            if mode != 'upsert':
+                result['errors'].append({'row': index, 'error': 'Username already exists'})
+                continue
+            params = {'id': id_by_username[username], 'email': email}
+            updates.append(params)
+        else:
+            params = {'username': username, 'email': email}
+            inserts.append(params)
+        written.append((index, params))
+
+    try:
+        if inserts:
+            db.session.execute(insert(User), inserts)
+        if updates:
+            db.session.execute(update(User), updates)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent writer took a username or email; retry row by row so
+        # only the conflicting rows are reported
+        db.session.rollback()
+        _write_user_rows(written, result)
+        return
+    except Exception as e:
+        db.session.rollback()
+        for index, _ in written:
+            result['errors'].append({'row': index, 'error': f'Batch failed: {e}'})
+        return
+
+    for row in updates:
+        user_cache.invalidate(row['id'])
+    result['inserted'] += len(inserts)
+    result['updated'] += len(updates)
+
+def _write_user_rows(written, result):
+    """Write a failed batch one row per transaction, reporting only the rows that fail"""
+    for index, params in written:
+        try:
+            if 'id' in params:
+                db.session.execute(update(User), [params])
+            else:
+                db.session.execute(insert(User), [params])
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            result['errors'].append({'row': index, 'error': 'Username or email already exists'})
+            continue
+        except Exception as e:
+            db.session.rollback()
+            result['errors'].append({'row': index, 'error': f'Write failed: {e}'})
+            continue
+        if 'id' in params:
+            user_cache.invalidate(params['id'])
+            result['updated'] += 1
+        else:
+            result['inserted'] += 1
+
+@user_bp.route('/users/cache/stats', methods=['GET'])
+def get_user_cache_stats():
+    return jsonify(user_cache.stats())
+
 @user_bp.route('/users/<int:user_id>', methods=['GET'])
 def get_user(user_id):
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return jsonify(cached)
     user = User.query.get_or_404(user_id)
-    return jsonify(user.to_dict())
+    user_dict = user.to_dict()
+    user_cache.put(user_dict)
+    return jsonify(user_dict)
+
+@user_bp.route('/users/by-username/<username>', methods=['GET'])
+def get_user_by_username(username):
+    cached = user_cache.get_by_username(username)
+    if cached is not None:
+        return jsonify(cached)
+    user = User.query.filter_by(username=username).first_or_404()
+    user_dict = user.to_dict()
+    user_cache.put(user_dict)
+    return jsonify(user_dict)
 
 @user_bp.route('/users/<int:user_id>', methods=['PUT'])
 def update_user(user_id):
@@ -29,6 +287,7 @@ def update_user(user_id):
     user.username = data.get('username', user.username)
     user.email = data.get('email', user.email)
     db.session.commit()
+    user_cache.invalidate(user_id)
     return jsonify(user.to_dict())
 
 @user_bp.route('/users/<int:user_id>', methods=['DELETE'])
@@ -36,4 +295,5 @@ def delete_user(user_id):
     user = User.query.get_or_404(user_id)
     db.session.delete(user)
     db.session.commit()
+    user_cache.invalidate(user_id)
     return '', 204
@@ -0,0 +1,123 @@
+import hashlib
+import random
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+# Bits per Bloom filter generation and hash functions per question
+FILTER_BITS = 2048
+NUM_HASHES = 4
+# Inserts before the current generation is retired (~2% false positives at 2048 bits)
+GENERATION_CAPACITY = 200
+# Seconds before the current generation is retired regardless of inserts
+GENERATION_MAX_AGE = 7 * 24 * 3600
+# Players remembered; the least recently active are dropped beyond this
+MAX_TRACKED_PLAYERS = 100_000
+# Random candidates scored per pick and players consulted per candidate
+CANDIDATE_SAMPLES = 32
+MAX_PLAYERS_CONSULTED = 64
+
+
+@lru_cache(maxsize=65536)
+def _bit_positions(question_id: str) -> Tuple[int, ...]:
+    digest = hashlib.blake2b(question_id.encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return tuple((h1 + i * h2) % FILTER_BITS for i in range(NUM_HASHES))
+
+
+class SeenFilter:
+    """Two-generation Bloom filter of question ids one player has seen.
+
+    New ids go into the current generation; when it fills up or grows old
+    it becomes the previous generation and the oldest one is discarded, so
+    questions age back into rotation at a fixed memory cost. Times come from
+    the owning store's clock.
+    """
+
+    __slots__ = ('current', 'previous', 'inserts', 'started_at')
+
+    def __init__(self, started_at: float):
+        self.current = bytearray(FILTER_BITS // 8)
+        self.previous = bytearray(FILTER_BITS // 8)
+        self.inserts = 0
+        self.started_at = started_at
+
+    def add(self, question_id: str, now: float) -> None:
+        if self.inserts >= GENERATION_CAPACITY or now - self.started_at > GENERATION_MAX_AGE:
+            self.previous = self.current
+            self.current = bytearray(FILTER_BITS // 8)
+            self.inserts = 0
+            self.started_at = now
+        for pos in _bit_positions(question_id):
+            self.current[pos >> 3] |= 1 << (pos & 7)
+        self.inserts += 1
+
+    def __contains__(self, question_id: str) -> bool:
+        positions = _bit_positions(question_id)
+        return (
+            all(self.current[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+            or all(self.previous[pos >> 3] & (1 << (pos & 7)) for pos in positions)
+        )
+
+
+def player_key(name: str) -> str:
+    """Players are recognised across rooms by their normalized name"""
+    return name.strip().lower()
+
+
+class SeenQuestionStore:
+    """Per-player seen-question filters used to pick fresh questions"""
+
+    def __init__(self, rng: Optional[random.Random] = None, clock=time.time):
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self._filters: 'OrderedDict[str, SeenFilter]' = OrderedDict()
+
+    def mark_seen(self, names: Sequence[str], question_id: str) -> None:
+        now = self.clock()
+        for name in names:
+            key = player_key(name)
+            seen = self._filters.get(key)
+            if seen is None:
+                seen = self._filters[key] = SeenFilter(now)
+                if len(self._filters) > MAX_TRACKED_PLAYERS:
+                    self._filters.popitem(last=False)
+            else:
+                self._filters.move_to_end(key)
+            seen.add(question_id, now)
+
+    def choose(self, questions: Sequence, names: Sequence[str]):
+        """Pick a question that the fewest present players have already seen"""
+        filters: List[SeenFilter] = []
+        for name in names:
+            seen = self._filters.get(player_key(name))
+            if seen is not None:
+                filters.append(seen)
+        if len(filters) > MAX_PLAYERS_CONSULTED:
+            filters = self.rng.sample(filters, MAX_PLAYERS_CONSULTED)
+        if not filters:
+            return self.rng.choice(questions)
+
+        count = len(questions)
+        if count <= CANDIDATE_SAMPLES:
+            candidates = list(range(count))
+            self.rng.shuffle(candidates)
+        else:
+            candidates = self.rng.sample(range(count), CANDIDATE_SAMPLES)
+
+        best, best_repeats = None, None
+        for index in candidates:
+            question = questions[index]
+            question_id = str(question['id'])
+            repeats = sum(1 for seen in filters if question_id in seen)
+            if best_repeats is None or repeats < best_repeats:
+                best, best_repeats = question, repeats
+                if repeats == 0:
+                    break
+        return best
+
+    def memory_size(self) -> int:
+        """Approximate bytes held by the filters"""
+        return len(self._filters) * 2 * (FILTER_BITS // 8)
@@ -0,0 +1,259 @@
+"""Deterministic in-process game simulator.
+
+Replays an event log against GameManager with a seeded RNG and a simulated
+clock, checks room invariants after every event and reports throughput. The
+same seed and log always produce the same outcome digest, so a failing
+run can be reproduced exactly and engine changes can be benchmarked without
+sockets.
+
+Events are JSON objects, one per line in a log file:
+
+    {"t": 1.5, "op": "create", "room": "r1", "sid": "r1p0", "name": "Ann"}
+
+`t` is seconds since the start of the run and `room` is a logical room name
+mapped to the code the engine generates. Ops: create, join, start, answer,
+card, next, leave.
+
+Usage:
+    python backend/simulate.py --rooms 1000 --players 6 --seed 7
+    python backend/simulate.py --rooms 50 --dump events.jsonl
+    python backend/simulate.py --replay events.jsonl --seed 7
+"""
+import argparse
+import hashlib
+import heapq
+import json
+import random
+import sys
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from achievements import UnlockStore
+from game_manager import GameManager
+from power_ups import POWER_UPS
+from room import Room
+
+# Violations kept verbatim in the report; the rest are only counted
+MAX_REPORTED_VIOLATIONS = 20
+
+# Free-text guesses used by synthetic players on survey questions
+SYNTHETIC_GUESSES = [
+    'pizza', 'sleep', 'phone', 'coffee', 'netflix', 'mom', 'dog', 'money',
+    'tiktok', 'tacos', 'gym', 'nothing', 'music', 'friends', 'school'
+]
+
+
+class SimClock:
+    """Clock that only moves when the simulator advances it"""
+
+    def __init__(self, start: float = 1_700_000_000.0):
+        self.start = start
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance_to(self, offset: float) -> None:
+        self.now = max(self.now, self.start + offset)
+
+
+def synthetic_events(rooms: int, players: int, rounds: int = 5, seed: int = 0,
+                     leave_rate: float = 0.02, card_rate: float = 0.1) -> Iterator[Dict]:
+    """Time-ordered events for `rooms` games played concurrently"""
+    rng = random.Random(seed)
+    cards = [card['id'] for card in POWER_UPS]
+    streams = []
+    for r in range(rooms):
+        room = f'r{r}'
+        t = rng.uniform(0, 60)
+        sids = [f'{room}p{i}' for i in range(players)]
+        events = [{'t': t, 'op': 'create', 'room': room, 'sid': sids[0], 'name': f'Host{r}'}]
+        for i, sid in enumerate(sids[1:], 1):
+            t += rng.uniform(0.1, 2.0)
+            events.append({'t': t, 'op': 'join', 'room': room, 'sid': sid, 'name': f'Player{r}_{i}'})
+        t += rng.uniform(1, 5)
+        events.append({'t': t, 'op': 'start', 'room': room, 'sid': sids[0]})
+
+        present = list(sids)
+        for _ in range(rounds):
+            round_start = t
+            for sid in list(present):
+                answer_t = round_start + rng.uniform(0.5, 20)
+                if rng.random() < card_rate:
+                    events.append({'t': answer_t - 0.2, 'op': 'card', 'room': room, 'sid': sid,
+                                   'card': rng.choice(cards)})
+                if rng.random() < leave_rate and len(present) > 1:
+                    events.append({'t': answer_t, 'op': 'leave', 'room': room, 'sid': sid})
+                    present.remove(sid)
+                    continue
+                events.append({'t': answer_t, 'op': 'answer', 'room': room, 'sid': sid, 'answer': {
+                    'answer_index': rng.randrange(4),
+                    'answer_text': rng.choice(SYNTHETIC_GUESSES)
+                }})
+                t = max(t, answer_t)
+            t += rng.uniform(2, 8)
+            events.append({'t': t, 'op': 'next', 'room': room, 'sid': present[0]})
+        for sid in present:
+            t += rng.uniform(0.1, 1)
+            events.append({'t': t, 'op': 'leave', 'room': room, 'sid': sid})
+        events.sort(key=lambda e: e['t'])
+        streams.append(events)
+    return heapq.merge(*streams, key=lambda e: e['t'])
+
+
+def read_events(path: str) -> Iterator[Dict]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def check_room(room: Room) -> List[str]:
+    """Invariants every room must satisfy between events"""
+    problems = []
+    if len(room.players_by_sid) != len(room.players) or any(
+        room.players_by_sid.get(p.sid) is not p for p in room.players
+    ):
+        problems.append('players_by_sid out of sync with players')
+    if len(room.players) > room.max_players:
+        problems.append('room over capacity')
+    hosts = sum(1 for p in room.players if p.is_host)
+    if hosts > 1 or (room.players and room.host_token is None and hosts != 1):
+        problems.append('room must have exactly one host')
+    if hosts and room.players_by_sid.get(room.host_sid) is None:
+        problems.append('host_sid is not a seated player')
+    answered = sum(1 for p in room.players if p.answered)
+    if room.answered_count != answered:
+        problems.append(f'answered_count {room.answered_count} != {answered} answered players')
+    if sum(room.option_histogram) > room.answered_count:
+        problems.append('option histogram counts more answers than were given')
+    if any(p.score < 0 for p in room.players):
+        problems.append('negative score')
+    if any(p.tokens < 0 for p in room.players):
+        problems.append('negative tokens')
+    return problems
+
+
+class Simulator:
+    """Drives a GameManager from an event stream with seeded RNG and simulated time"""
+
+    def __init__(self, seed: int = 0, check: bool = True):
+        self.clock = SimClock()
+        # Built-in questions and an in-memory unlock store, whatever the environment says
+        self.manager = GameManager(
+            rng=random.Random(seed),
+            clock=self.clock,
+            question_bank='',
+            unlock_store=UnlockStore()
+        )
+        self.check = check
+        # Logical room name from the log -> room code generated by the engine
+        self.codes: Dict[str, str] = {}
+        self.events = 0
+        self.failures: Dict[str, int] = {}
+        self.violations = 0
+        self.expired_rounds = 0
+        self.violation_samples: List[Dict] = []
+        self._digest = hashlib.sha256()
+
+    def apply(self, event: Dict) -> Dict:
+        manager = self.manager
+        op = event['op']
+        sid = event.get('sid')
+        if op == 'create':
+            result = manager.create_room(event.get('name', sid), sid,
+                                         public=event.get('public', False),
+                                         large_room=event.get('large_room', False))
+            if result.get('success'):
+                self.codes[event['room']] = result['room_code']
+            return result
+
+        code = self.codes.get(event['room'], '')
+        if op == 'join':
+            return manager.join_room(code, event.get('name', sid), sid)
+        if op == 'start':
+            return manager.start_game(code, event.get('settings', {}))
+        if op == 'answer':
+            return manager.submit_answer(code, sid, event.get('answer', {}), rtt=event.get('rtt', 0.0))
+        if op == 'card':
+            return manager.use_power_up(code, sid, event.get('card', ''))
+        if op == 'next':
+            return manager.next_round(code)
+        if op == 'leave':
+            return manager.remove_player(code, sid)
+        return {'success': False, 'error': f'Unknown op {op}'}
+
+    def run(self, events: Iterable[Dict]) -> Dict:
+        started = time.perf_counter()
+        for event in events:
+            self.clock.advance_to(event.get('t', 0.0))
+            # Rounds time out between events just as the server's round timer closes them
+            self.expired_rounds += len(self.manager.expire_rounds())
+            result = self.apply(event)
+            self.events += 1
+            if not result.get('success'):
+                self.failures[event['op']] = self.failures.get(event['op'], 0) + 1
+            room = self.manager.get_room(self.codes.get(event['room'], ''))
+            self._fold_digest(event, result, room)
+            if self.check and room is not None:
+                for problem in check_room(room):
+                    self.violations += 1
+                    if len(self.violation_samples) < MAX_REPORTED_VIOLATIONS:
+                        self.violation_samples.append({'event': self.events, 'op': event['op'],
+                                                       'room': event['room'], 'problem': problem})
+        elapsed = time.perf_counter() - started
+        return {
+            'events': self.events,
+            'seconds': round(elapsed, 3),
+            'events_per_second': round(self.events / elapsed) if elapsed else 0,
+            'simulated_seconds': round(self.clock.now - self.clock.start, 3),
+            'rooms_created': len(self.codes),
+            'rooms_open': len(self.manager.rooms),
+            'failures': self.failures,
+            'expired_rounds': self.expired_rounds,
+            'violations': self.violations,
+            'violation_samples': self.violation_samples,
+            'digest': self._digest.hexdigest()[:16]
+        }
+
+    def _fold_digest(self, event: Dict, result: Dict, room: Optional[Room]) -> None:
+        """Fold each event's outcome into a hash that is equal across identical runs"""
+        state = f"{event['op']}:{bool(result.get('success'))}"
+        if room is not None:
+            question = room.current_question or {}
+            state += f":{room.room_code}:{room.current_round}:{question.get('id')}:" + ','.join(
+                f'{p.score}/{p.tokens}' for p in room.players
+            )
+        self._digest.update(state.encode('utf-8'))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Replay game events against GameManager in-process')
+    parser.add_argument('--replay', help='JSONL event log to replay instead of synthetic games')
+    parser.add_argument('--rooms', type=int, default=1000, help='synthetic rooms')
+    parser.add_argument('--players', type=int, default=6, help='players per synthetic room')
+    parser.add_argument('--rounds', type=int, default=5, help='rounds per synthetic game')
+    parser.add_argument('--seed', type=int, default=0, help='seed for the engine and the generator')
+    parser.add_argument('--dump', help='write the synthetic event log here and exit')
+    parser.add_argument('--no-check', action='store_true', help='skip invariant checks')
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        events = read_events(args.replay)
+    else:
+        events = synthetic_events(args.rooms, args.players, args.rounds, args.seed)
+
+    if args.dump:
+        with open(args.dump, 'w', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(',', ':')) + '\n')
+        return 0
+
+    report = Simulator(seed=args.seed, check=not args.no_check).run(events)
+    print(json.dumps(report, indent=2))
+    return 1 if report['violations'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def spectator_room(room_code: str) -> str:
+    """Socket.IO room that spectators of a game room join"""
+    return f'{room_code}:spectators'
+
+
+class SpectatorFeed:
+    """Coalesced, rate-limited state snapshots for spectators.
+
+    Handlers mark a room dirty whenever its state changes; a background task
+    wakes every `interval` seconds and emits at most one snapshot per dirty
+    room, so the cost of a spectator sub-room is independent of how many
+    answers or updates happened in between.
+    """
+
+    event = 'spectator_state'
+
+    def __init__(self, socketio, game_manager, interval: float = 1.0, outbound=None):
+        self.socketio = socketio
+        self.outbound = outbound
+        self.game_manager = game_manager
+        self.interval = interval
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._started = False
+        self.snapshots_sent = 0
+        self.updates_coalesced = 0
+
+    def start(self) -> None:
+        """Start the broadcast loop once"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.socketio.start_background_task(self._run)
+
+    def mark_dirty(self, room_code: str) -> None:
+        """Record that a room's state changed since the last snapshot"""
+        if not self._has_audience(room_code):
+            return
+        with self._lock:
+            if room_code in self._dirty:
+                self.updates_coalesced += 1
+            self._dirty.add(room_code)
+
+    def discard(self, room_code: str) -> None:
+        """Drop a pending snapshot that would now be stale"""
+        with self._lock:
+            self._dirty.discard(room_code)
+
+    def _has_audience(self, room_code: str) -> bool:
+        return bool(self.game_manager.spectators.get(room_code))
+
+    def _snapshot(self, room_code: str):
+        return self.game_manager.get_spectator_snapshot(room_code)
+
+    def _target(self, room_code: str) -> str:
+        return spectator_room(room_code)
+
+    def _run(self) -> None:
+        while True:
+            self.socketio.sleep(self.interval)
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+            for room_code in dirty:
+                try:
+                    snapshot = self._snapshot(room_code)
+                    if snapshot is None:
+                        continue
+                    if self.outbound is not None:
+                        self.outbound.emit_to_room(self.event, snapshot, self._target(room_code))
+                    else:
+                        self.socketio.emit(self.event, snapshot, room=self._target(room_code))
+                    self.snapshots_sent += 1
+                except Exception as e:
+                    logger.error(f"{self.event} snapshot error for {room_code}: {e}")
+
+
+class AnswerProgressFeed(SpectatorFeed):
+    """Coalesced answer_progress broadcasts for large rooms.
+
+    A large room used to get one progress broadcast per answer, which is
+    quadratic in room size per round; this sends at most one per interval.
+    """
+
+    event = 'answer_progress'
+
+    def _has_audience(self, room_code: str) -> bool:
+        return True
+
+    def _snapshot(self, room_code: str):
+        room = self.game_manager.get_room(room_code)
+        # A round that closed in the meantime is announced by round_ended instead
+        if room is None or room.reveal:
+            return None
+        return self.game_manager.get_answer_progress(room_code)
+
+    def _target(self, room_code: str) -> str:
+        return room_code
+
+
+class RoomUpdateFeed(AnswerProgressFeed):
+    """Coalesced room_updated broadcasts for large rooms.
+
+    Joins and leaves in a large room each changed the whole room's view,
+    so a burst of arrivals sent one full update per arrival to every
+    member; this sends the latest state at most once per interval.
+    """
+
+    event = 'room_updated'
+
+    def _snapshot(self, room_code: str):
+        room = self.game_manager.get_room(room_code)
+        return room.to_wire() if room is not None else None
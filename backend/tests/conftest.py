@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# Backend modules import each other as top-level modules, as when run from backend/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep tests off the on-disk user database and unlock store
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.pop('ACHIEVEMENT_STORE', None)
+os.environ.pop('QUESTION_BANK', None)
+
+
+@pytest.fixture
+def user_client():
+    """Test client for the app with an empty users table and user cache"""
+    pytest.importorskip('flask_socketio')
+    pytest.importorskip('flask_sqlalchemy')
+    from main import app
+    from models.user import db
+    from routes.user import user_cache
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    user_cache.clear()
+    yield app.test_client()
+    user_cache.clear()
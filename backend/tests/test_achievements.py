@@ -0,0 +1,42 @@
+from achievements import MIND_READER_STREAK, AchievementEngine
+from room import Player, Room, default_settings
+
+
+def room_with(*players, room_code='ROOM01'):
+    room = Room(room_code, None, 10, default_settings())
+    for player in players:
+        room.add_player(player)
+    return room
+
+
+def play_rounds(engine, room, rounds):
+    for _ in range(rounds):
+        for player in room.players:
+            player.answer_index = 0
+        engine.round_resolved(room, [0])
+
+
+def test_players_sharing_a_name_keep_separate_streaks():
+    engine = AchievementEngine()
+    bobs = [Player('Bob', f'sid{i}') for i in range(3)]
+    room = room_with(*bobs)
+
+    play_rounds(engine, room, MIND_READER_STREAK - 1)
+    bobs[2].answer_index = 1
+    engine.round_resolved(room, [0])
+
+    unlocked_by = [unlock['player_sid'] for unlock in engine.pop_unlocks(room.room_code)]
+    assert unlocked_by == ['sid0', 'sid1']
+
+
+def test_unlocks_do_not_follow_a_reused_name():
+    engine = AchievementEngine()
+    room = room_with(Player('Alice', 'first'))
+    play_rounds(engine, room, MIND_READER_STREAK)
+    assert len(engine.pop_unlocks(room.room_code)) == 1
+
+    impostor_room = room_with(Player('alice', 'second'), room_code='ROOM02')
+    play_rounds(engine, impostor_room, 1)
+
+    assert engine._get('second').unlocked == set()
+    assert engine._get('second').top_streak == 1
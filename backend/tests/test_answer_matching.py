@@ -0,0 +1,87 @@
+import json
+import random
+
+import pytest
+
+from answer_matcher import AnswerMatcher
+from content_ingest import ingest
+from game_manager import GameManager
+
+SURVEY_PACK = [
+    {
+        'id': 'voice_chat',
+        'category': 'Gaming Culture',
+        'question': "What's the most annoying thing someone can do in a Discord voice chat?",
+        'answers': [
+            {'text': 'Breathing loudly', 'points': 40},
+            {'text': 'Echo/feedback', 'points': 30},
+            {'text': 'Eating sounds', 'points': 20},
+            {'text': 'Keyboard clicking', 'points': 5}
+        ]
+    }
+]
+
+
+@pytest.mark.parametrize('guess, expected', [
+    ('Dog', 'Dog'),
+    ('big dog', 'Dog'),
+    ('kitty cat', 'Cat'),
+    ('fish', 'Gold fish'),
+    ('parrot', None)
+])
+def test_extra_words_on_either_side_still_match(guess, expected):
+    matcher = AnswerMatcher([{'text': 'Dog'}, {'text': 'Cat'}, {'text': 'Gold fish'}])
+    match = matcher.match(guess)
+    assert (match and match['text']) == expected
+
+
+@pytest.fixture
+def survey_manager(tmp_path, monkeypatch):
+    """GameManager serving a bank ingested from a survey content pack"""
+    pack = tmp_path / 'pack.jsonl'
+    pack.write_text(''.join(json.dumps(q) + '\n' for q in SURVEY_PACK), encoding='utf-8')
+    bank = tmp_path / 'questions.bank'
+    assert ingest([str(pack)], str(bank))['written'] == len(SURVEY_PACK)
+    monkeypatch.setenv('QUESTION_BANK', str(bank))
+    monkeypatch.delenv('ACHIEVEMENT_STORE', raising=False)
+    return GameManager(rng=random.Random(1))
+
+
+def test_free_text_answers_score_against_the_board(survey_manager):
+    manager = survey_manager
+    room_code = manager.create_room('Ann', 'ann')['room_code']
+    manager.join_room(room_code, 'Bob', 'bob')
+    manager.join_room(room_code, 'Cid', 'cid')
+    assert manager.start_game(room_code, {})['success']
+    assert manager.get_room(room_code).current_question['id'] == 'voice_chat'
+
+    # Synonyms, plurals and typos all land on a board answer
+    assert manager.submit_answer(room_code, 'ann', {'answer_text': 'chewing noises'})['player_score'] == 20
+    assert manager.submit_answer(room_code, 'bob', {'answer_text': 'breathng loud'})['player_score'] == 40
+    result = manager.submit_answer(room_code, 'cid', {'answer_text': 'being too good at the game'})
+    assert result['player_score'] == 0
+    assert result['all_answered']
+
+    players = manager.get_room(room_code).players_by_sid
+    assert players['ann'].last_match['text'] == 'Eating sounds'
+    assert players['bob'].last_match['rank'] == 1
+    assert players['cid'].last_match is None
+
+    # Survey points count toward the round's results even though they were awarded on submit
+    reveal = manager.get_room(room_code).reveal
+    assert reveal['round_scores'] == {'ann': 20, 'bob': 40, 'cid': 0}
+    assert manager.get_player_result(room_code, 'bob')['round_points'] == 40
+
+
+def test_guess_endpoint_is_mounted():
+    pytest.importorskip('flask_socketio')
+    pytest.importorskip('flask_cors')
+    from main import app
+
+    client = app.test_client()
+    response = client.post('/api/content/questions/1/guess', json={'guess': 'bad mic'})
+    assert response.status_code == 200
+    assert response.get_json()['answer']['text'] == 'Bad microphone'
+
+    response = client.post('/api/content/questions/4/guess', json={'guess': 'memes'})
+    assert response.status_code == 404
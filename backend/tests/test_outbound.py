@@ -0,0 +1,117 @@
+from outbound import NAMESPACE, OutboundQueues
+
+
+class FakeQueue:
+    def __init__(self):
+        self.size = 0
+
+    def qsize(self):
+        return self.size
+
+
+class FakeSocket:
+    def __init__(self):
+        self.queue = FakeQueue()
+
+
+class FakeServer:
+    """Just enough of a python-socketio server for OutboundQueues"""
+
+    def __init__(self):
+        self.rooms = {}
+        self.sockets = {}
+        self.disconnected = []
+        self.manager = self
+        self.eio = self
+
+    def sid_from_eio_sid(self, eio_sid, namespace):
+        return eio_sid
+
+    def eio_sid_from_sid(self, sid, namespace):
+        return sid if sid in self.sockets else None
+
+    def disconnect(self, sid, namespace=None):
+        self.disconnected.append(sid)
+
+
+class FakeSocketIO:
+    def __init__(self, room, sids):
+        self.server = FakeServer()
+        self.server.rooms = {NAMESPACE: {room: {sid: sid for sid in sids}}}
+        self.server.sockets = {sid: FakeSocket() for sid in sids}
+        self.emitted = []
+
+    def emit(self, event, data, to=None, skip_sid=None):
+        self.emitted.append((event, data, to, skip_sid))
+
+
+def queues(max_queued=4):
+    socketio = FakeSocketIO('ROOM', ['fast', 'slow'])
+    outbound = OutboundQueues(socketio, max_backlog=2, max_queued=max_queued)
+    socketio.server.sockets['slow'].queue.size = 5
+    outbound._mark_lagging()
+    return socketio, outbound
+
+
+def test_lagging_member_is_skipped_and_held():
+    socketio, outbound = queues()
+
+    outbound.emit_to_room('round_started', {'round': 1}, 'ROOM')
+
+    assert socketio.emitted == [('round_started', {'round': 1}, 'ROOM', ['slow'])]
+    assert outbound.report()['queued_messages'] == 1
+
+
+def test_snapshots_supersede_older_copies():
+    socketio, outbound = queues()
+
+    outbound.emit_to_room('room_updated', {'version': 1}, 'ROOM')
+    outbound.emit_to_room('round_started', {'round': 1}, 'ROOM')
+    outbound.emit_to_room('room_updated', {'version': 2}, 'ROOM')
+
+    held = list(outbound._outboxes['slow'].values())
+    assert held == [('round_started', {'round': 1}), ('room_updated', {'version': 2})]
+    assert outbound.stats['superseded'] == 1
+
+
+def test_flush_sends_held_messages_in_order_once_drained():
+    socketio, outbound = queues()
+    outbound.emit_to_room('round_started', {'round': 1}, 'ROOM')
+    outbound.emit_to_client('your_result', {'points': 10}, 'slow')
+
+    outbound._flush()
+    assert outbound.stats['flushed'] == 0
+
+    socketio.server.sockets['slow'].queue.size = 0
+    socketio.emitted.clear()
+    outbound._flush()
+
+    assert socketio.emitted == [
+        ('round_started', {'round': 1}, 'slow', None),
+        ('your_result', {'points': 10}, 'slow', None)
+    ]
+    assert outbound.report()['lagging_clients'] == 0
+
+
+def test_bound_drops_ordinary_events_before_transitions():
+    socketio, outbound = queues(max_queued=2)
+
+    outbound.emit_to_room('chaos_card_used', {}, 'ROOM')
+    outbound.emit_to_room('round_started', {'round': 1}, 'ROOM')
+    outbound.emit_to_room('round_ended', {'round': 1}, 'ROOM')
+
+    events = [event for event, _ in outbound._outboxes['slow'].values()]
+    assert events == ['round_started', 'round_ended']
+    assert outbound.stats['dropped'] == 1
+    assert socketio.server.disconnected == []
+
+
+def test_outbox_of_transitions_past_the_bound_disconnects():
+    socketio, outbound = queues(max_queued=2)
+
+    for round_number in range(3):
+        outbound.emit_to_room('round_started', {'round': round_number}, 'ROOM')
+
+    assert socketio.server.disconnected == ['slow']
+    assert outbound.stats['overflowed'] == 1
+    assert outbound.report() == dict(outbound.stats, lagging_clients=0, queued_messages=0)
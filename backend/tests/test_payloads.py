@@ -0,0 +1,65 @@
+import pytest
+
+from payloads import DEFAULT_PAYLOAD_BYTES, PayloadGuard
+
+
+@pytest.fixture
+def guard():
+    emitted = []
+    guard = PayloadGuard(lambda event, data: emitted.append((event, data)))
+    guard.emitted = emitted
+    return guard
+
+
+def handled(guard, event, data):
+    """Run a payload through the guard and return what the handler received"""
+    received = []
+    guard.validate(event)(received.append)(data)
+    return received[0] if received else None
+
+
+def test_unknown_fields_are_stripped(guard):
+    clean = handled(guard, 'join_room', {'room_code': 'ABC123', 'player_name': 'Ann', 'is_admin': True})
+
+    assert clean == {'room_code': 'ABC123', 'player_name': 'Ann'}
+    assert guard.emitted == []
+
+
+def test_nested_settings_are_validated_and_stripped(guard):
+    clean = handled(guard, 'start_game', {
+        'room_code': 'ABC123',
+        'settings': {'chaos_cards': False, 'max_players': 5000}
+    })
+    assert clean == {'room_code': 'ABC123', 'settings': {'chaos_cards': False}}
+
+    assert handled(guard, 'start_game', {'room_code': 'ABC123', 'settings': {'roast_mode': 'yes'}}) is None
+    assert guard.emitted[-1][1]['message'] == 'settings.roast_mode has the wrong type'
+
+
+@pytest.mark.parametrize('event, data, reason', [
+    ('join_room', {'room_code': 123}, 'room_code has the wrong type'),
+    ('get_roster', {'room_code': 'ABC123', 'page': True}, 'page has the wrong type'),
+    ('get_roster', {'room_code': 'ABC123', 'per_page': 500}, 'per_page is too large'),
+    ('submit_answer', {'answer_data': {'answer_index': -1}}, 'answer_data.answer_index is too small'),
+    ('create_room', {'player_name': 'x' * 65}, 'player_name is too long'),
+    ('leave_room', ['ABC123'], 'payload must be an object'),
+    ('use_chaos_card', {'room_code': 'ABC123', 'junk': ['x'] * DEFAULT_PAYLOAD_BYTES}, 'payload too large')
+])
+def test_rejected_payloads_never_reach_the_handler(guard, event, data, reason):
+    assert handled(guard, event, data) is None
+    assert guard.emitted == [('payload_error', {'event': event, 'message': reason})]
+    assert guard.report() == {event: 1}
+
+
+def test_bool_is_accepted_where_declared(guard):
+    assert handled(guard, 'create_room', {'player_name': 'Ann', 'public': True}) == {
+        'player_name': 'Ann', 'public': True
+    }
+
+
+def test_rejections_are_counted_per_event(guard):
+    for _ in range(3):
+        handled(guard, 'next_round', {'room_code': None, 'extra': 'x' * 2000})
+    handled(guard, 'reveal_answer', 'ABC123')
+
+    assert guard.report() == {'next_round': 3, 'reveal_answer': 1}
@@ -0,0 +1,115 @@
+import random
+
+from game_manager import GameManager
+from power_ups import PLAYER_COOLDOWN, ROOM_COOLDOWN, STEAL_POINTS, TIME_FREEZE_SECONDS
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def started_room():
+    clock = Clock()
+    manager = GameManager(rng=random.Random(0), clock=clock)
+    room_code = manager.create_room('A', 'a')['room_code']
+    manager.join_room(room_code, 'B', 'b')
+    manager.join_room(room_code, 'C', 'c')
+    manager.start_game(room_code, {})
+    return manager, clock, room_code
+
+
+def test_cards_cost_tokens():
+    manager, clock, room_code = started_room()
+    player = manager.get_room(room_code).players_by_sid['a']
+    tokens = player.tokens
+
+    assert manager.use_power_up(room_code, 'a', 'steal_points')['tokens'] == tokens - 2
+
+    player.tokens = 0
+    clock.now += ROOM_COOLDOWN
+    assert manager.use_power_up(room_code, 'a', 'double_down')['error'] == 'Not enough tokens'
+    assert player.tokens == 0
+
+
+def test_player_and_room_cooldowns_reject_cards():
+    manager, clock, room_code = started_room()
+    assert manager.use_power_up(room_code, 'a', 'meme_bomb')['success']
+
+    rejected = manager.use_power_up(room_code, 'b', 'chaos_card')
+    assert rejected['error'] == 'Room card cooldown'
+    assert rejected['retry_after'] == ROOM_COOLDOWN
+
+    clock.now += ROOM_COOLDOWN + 1
+    rejected = manager.use_power_up(room_code, 'a', 'meme_bomb')
+    assert rejected['error'] == 'Card is on cooldown'
+    assert rejected['retry_after'] == PLAYER_COOLDOWN - ROOM_COOLDOWN - 1
+
+    clock.now += PLAYER_COOLDOWN
+    assert manager.use_power_up(room_code, 'a', 'meme_bomb')['success']
+
+
+def test_repeats_collapse_into_one_broadcast():
+    manager, clock, room_code = started_room()
+    assert manager.use_power_up(room_code, 'a', 'meme_bomb')['broadcast']
+    clock.now += 2.5
+    assert not manager.use_power_up(room_code, 'b', 'meme_bomb')['broadcast']
+    clock.now += 2.1
+    assert not manager.use_power_up(room_code, 'c', 'meme_bomb')['broadcast']
+
+    clock.now += 2.1
+    result = manager.use_power_up(room_code, 'a', 'chaos_card')
+    assert result['broadcast']
+    assert result['collapsed'] == 2
+
+
+def test_double_down_and_steal_settle_at_resolve():
+    manager, clock, room_code = started_room()
+    room = manager.get_room(room_code)
+    # C leads on 50 points from earlier rounds
+    leader = room.players_by_sid['c']
+    leader.score = leader.round_start_score = 50
+    manager.use_power_up(room_code, 'a', 'double_down')
+    clock.now += ROOM_COOLDOWN
+    manager.use_power_up(room_code, 'b', 'steal')
+
+    manager.submit_answer(room_code, 'a', {'answer_index': 0})
+    manager.submit_answer(room_code, 'b', {'answer_index': 0})
+    manager.submit_answer(room_code, 'c', {'answer_index': 1})
+
+    # Two of three picked option 0 (67 points each), C's 33 points is the odd one out
+    assert room.scores() == {'a': 134, 'b': 67 + STEAL_POINTS, 'c': 50 + 33 - STEAL_POINTS}
+    assert room.reveal['round_scores'] == {'a': 134, 'b': 67 + STEAL_POINTS, 'c': 33 - STEAL_POINTS}
+    assert room.players_by_sid['a'].multiplier == 1
+    assert not room.players_by_sid['b'].stealing
+
+
+def test_time_freeze_requeues_the_round_deadline():
+    manager, clock, room_code = started_room()
+    room = manager.get_room(room_code)
+    deadline = room.round_ends_at
+
+    assert manager.use_power_up(room_code, 'a', 'time_freeze')['effect'] == {
+        'round_ends_at': deadline + TIME_FREEZE_SECONDS
+    }
+
+    clock.now = deadline + 1
+    assert manager.expire_rounds() == []
+    assert room.reveal is None
+    assert manager.submit_answer(room_code, 'a', {'answer_index': 0})['success']
+
+    clock.now = deadline + TIME_FREEZE_SECONDS + 1
+    assert manager.expire_rounds() == [room_code]
+    assert room.reveal is not None
+
+
+def test_answers_after_the_deadline_are_rejected():
+    manager, clock, room_code = started_room()
+    clock.now = manager.get_room(room_code).round_ends_at + 5
+
+    assert manager.submit_answer(room_code, 'a', {'answer_index': 0})['error'] == 'Time is up'
+    assert manager.expire_rounds() == [room_code]
+    assert manager.submit_answer(room_code, 'b', {'answer_index': 0})['error'] == 'Round is over'
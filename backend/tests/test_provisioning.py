@@ -0,0 +1,81 @@
+import random
+
+from game_manager import PROVISIONED_ROOM_TTL, GameManager
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def provisioned(count=3, **kwargs):
+    clock = Clock()
+    manager = GameManager(rng=random.Random(0), clock=clock)
+    result = manager.provision_rooms(count, **kwargs)
+    assert result['success']
+    return manager, clock, result['rooms']
+
+
+def test_batch_reserves_distinct_empty_rooms():
+    manager, clock, rooms = provisioned(50, settings={'chaos_cards': False}, total_rounds=7)
+
+    codes = {room['room_code'] for room in rooms}
+    assert len(codes) == 50
+    assert len({room['host_token'] for room in rooms}) == 50
+    assert all(room['expires_at'] == clock.now + PROVISIONED_ROOM_TTL for room in rooms)
+    for code in codes:
+        room = manager.get_room(code)
+        assert room.players == [] and room.host_sid is None
+        assert room.total_rounds == 7 and room.settings['chaos_cards'] is False
+
+
+def test_host_token_claims_the_host_seat():
+    manager, clock, rooms = provisioned()
+    code, token = rooms[0]['room_code'], rooms[0]['host_token']
+    manager.join_room(code, 'Early', 'early')
+
+    assert manager.join_room(code, 'Host', 'host', token)['success']
+
+    room = manager.get_room(code)
+    assert room.host_sid == 'host'
+    assert [p.sid for p in room.players if p.is_host] == ['host']
+    assert room.host_token is None
+    # The token is spent once claimed
+    assert manager.join_room(code, 'Late', 'late', token)['error'] == 'Invalid host token'
+
+
+def test_bad_host_tokens_are_rejected():
+    manager, clock, rooms = provisioned()
+    code, token = rooms[0]['room_code'], rooms[0]['host_token']
+
+    for bad in (token[:-1] + ('A' if token[-1] != 'A' else 'B'), 'tökén', rooms[1]['host_token']):
+        assert manager.join_room(code, 'Mallory', 'mallory', bad)['error'] == 'Invalid host token'
+    assert manager.get_room(code).players == []
+
+
+def test_expired_tokens_delete_empty_rooms_and_hand_over_occupied_ones():
+    manager, clock, rooms = provisioned(2)
+    empty, occupied = rooms[0]['room_code'], rooms[1]['room_code']
+    manager.join_room(occupied, 'Guest', 'guest')
+
+    clock.now += PROVISIONED_ROOM_TTL - 1
+    assert manager.sweep_unclaimed_rooms() == 0
+
+    clock.now += 2
+    assert manager.sweep_unclaimed_rooms() == 2
+    assert manager.get_room(empty) is None
+    room = manager.get_room(occupied)
+    assert room.host_sid == 'guest' and room.host_token is None
+
+
+def test_quick_match_skips_rooms_waiting_for_their_host():
+    manager, clock, rooms = provisioned(public=True)
+    code = rooms[0]['room_code']
+    manager.join_room(code, 'Guest', 'guest')
+    assert manager.find_quick_match() is None
+
+    manager.join_room(code, 'Host', 'host', rooms[0]['host_token'])
+    assert manager.find_quick_match() == code
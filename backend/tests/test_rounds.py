@@ -0,0 +1,75 @@
+import random
+import threading
+
+from game_manager import GameManager
+
+
+def started_room(players=('a', 'b', 'c')):
+    manager = GameManager(rng=random.Random(0))
+    room_code = manager.create_room(players[0].upper(), players[0])['room_code']
+    for sid in players[1:]:
+        manager.join_room(room_code, sid.upper(), sid)
+    manager.start_game(room_code, {})
+    return manager, room_code
+
+
+def test_next_round_scores_an_open_round():
+    manager, room_code = started_room()
+    manager.submit_answer(room_code, 'a', {'answer_index': 0})
+    manager.submit_answer(room_code, 'b', {'answer_index': 0})
+
+    result = manager.next_round(room_code)
+
+    assert result['success']
+    assert manager.get_room(room_code).scores() == {'a': 100, 'b': 100, 'c': 0}
+
+
+def test_answers_after_reveal_are_rejected():
+    manager, room_code = started_room()
+    manager.submit_answer(room_code, 'a', {'answer_index': 0})
+    manager.resolve_round(room_code)
+
+    assert manager.submit_answer(room_code, 'b', {'answer_index': 0})['error'] == 'Round is over'
+
+
+def test_leaver_completing_the_round_resolves_it():
+    manager, room_code = started_room()
+    manager.submit_answer(room_code, 'a', {'answer_index': 1})
+    manager.submit_answer(room_code, 'b', {'answer_index': 2})
+
+    result = manager.remove_player(room_code, 'c')
+
+    assert result['round_ended']
+    reveal = manager.get_room(room_code).reveal
+    assert reveal['round_scores'] == {'a': 50, 'b': 50}
+
+
+def test_round_trip_allowance_is_capped():
+    manager, room_code = started_room()
+    ends_at = manager.get_room(room_code).round_ends_at
+
+    late = manager.submit_answer(room_code, 'a', {'answer_index': 0}, rtt=30.0, received_at=ends_at + 5)
+    on_time = manager.submit_answer(room_code, 'b', {'answer_index': 0}, rtt=30.0, received_at=ends_at + 0.5)
+
+    assert late['error'] == 'Time is up'
+    assert on_time['success']
+    assert manager.get_room(room_code).players_by_sid['b'].response_time == 59.5
+
+
+def test_long_poll_wakes_only_for_its_room():
+    manager, room_code = started_room()
+    other_code = manager.create_room('Z', 'z')['room_code']
+    version = manager.get_room(room_code).version
+    woken = []
+
+    waiter = threading.Thread(target=lambda: woken.append(manager.wait_for_change(room_code, version, 5)))
+    waiter.start()
+    manager.join_room(other_code, 'Y', 'y')
+    waiter.join(0.2)
+    assert waiter.is_alive()
+
+    manager.submit_answer(room_code, 'a', {'answer_index': 0})
+    waiter.join(5)
+
+    assert woken == [manager.get_room(room_code)]
+    assert manager._room_waiters == {}
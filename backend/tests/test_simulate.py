@@ -0,0 +1,28 @@
+from simulate import Simulator, synthetic_events
+
+
+def run(seed=3):
+    return Simulator(seed=seed).run(synthetic_events(20, 4, seed=seed))
+
+
+def test_runs_ignore_the_environment(tmp_path, monkeypatch):
+    baseline = run()
+
+    store = tmp_path / 'unlocks.jsonl'
+    monkeypatch.setenv('ACHIEVEMENT_STORE', str(store))
+    monkeypatch.setenv('QUESTION_BANK', str(tmp_path / 'missing.bank'))
+    report = run()
+
+    assert report['violations'] == baseline['violations'] == 0
+    assert report['digest'] == baseline['digest']
+    assert not store.exists()
+
+
+def test_seen_question_filters_use_the_simulated_clock():
+    simulator = Simulator(seed=3)
+    simulator.run(synthetic_events(5, 4, seed=3))
+
+    filters = simulator.manager.seen_questions._filters.values()
+    assert filters
+    assert all(seen.started_at >= simulator.clock.start for seen in filters)
+    assert all(seen.started_at < simulator.clock.start + 86400 for seen in filters)
@@ -0,0 +1,88 @@
+import pytest
+
+from routes.user import UserCache, user_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def stats():
+    current = user_cache.stats()
+    return current['hits'], current['misses']
+
+
+def create(client, username):
+    return client.post('/api/users', json={'username': username, 'email': f'{username}@example.com'}).get_json()
+
+
+def test_reads_miss_then_hit(user_client):
+    ann = create(user_client, 'ann')
+
+    assert user_client.get(f"/api/users/{ann['id']}").get_json() == ann
+    assert stats() == (0, 1)
+    assert user_client.get(f"/api/users/{ann['id']}").get_json() == ann
+    assert user_client.get('/api/users/by-username/ann').get_json() == ann
+    assert stats() == (2, 1)
+    assert user_cache.stats()['hit_rate'] == pytest.approx(2 / 3, abs=1e-4)
+    assert user_client.get('/api/users/cache/stats').get_json()['size'] == 1
+
+
+def test_put_invalidates(user_client):
+    ann = create(user_client, 'ann')
+    user_client.get(f"/api/users/{ann['id']}")
+
+    user_client.put(f"/api/users/{ann['id']}", json={'username': 'anna'})
+    assert user_cache.get(ann['id']) is None
+    assert user_cache.get_by_username('ann') is None
+    assert user_client.get('/api/users/by-username/anna').get_json()['username'] == 'anna'
+
+
+def test_delete_invalidates(user_client):
+    ann = create(user_client, 'ann')
+    user_client.get(f"/api/users/{ann['id']}")
+
+    assert user_client.delete(f"/api/users/{ann['id']}").status_code == 204
+    assert user_cache.get(ann['id']) is None
+    assert user_cache.stats()['size'] == 0
+
+
+def test_bulk_upsert_invalidates(user_client):
+    ann = create(user_client, 'ann')
+    user_client.get(f"/api/users/{ann['id']}")
+
+    result = user_client.post('/api/users/bulk?mode=upsert', json=[
+        {'username': 'ann', 'email': 'ann@new.example.com'}
+    ]).get_json()
+    assert result['updated'] == 1
+    assert user_client.get(f"/api/users/{ann['id']}").get_json()['email'] == 'ann@new.example.com'
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = UserCache(ttl=10, clock=clock)
+    cache.put({'id': 1, 'username': 'ann', 'email': 'ann@example.com'})
+
+    clock.now = 10.0
+    assert cache.get(1)['username'] == 'ann'
+    clock.now = 10.5
+    assert cache.get(1) is None
+    assert cache.get_by_username('ann') is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = UserCache(max_size=2, clock=FakeClock())
+    for user_id, name in enumerate(['ann', 'bob'], 1):
+        cache.put({'id': user_id, 'username': name, 'email': f'{name}@example.com'})
+    cache.get(1)
+    cache.put({'id': 3, 'username': 'cat', 'email': 'cat@example.com'})
+
+    assert cache.get(2) is None
+    assert cache.get_by_username('bob') is None
+    assert cache.get(1) is not None and cache.get(3) is not None
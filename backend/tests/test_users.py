@@ -0,0 +1,85 @@
+import json
+
+
+def post_ndjson(client, lines, mode=None):
+    body = ''.join((line if isinstance(line, str) else json.dumps(line)) + '\n' for line in lines)
+    url = '/api/users/bulk' + (f'?mode={mode}' if mode else '')
+    return client.post(url, data=body, content_type='application/x-ndjson')
+
+
+def test_create_and_update_store_normalized_email(user_client):
+    created = user_client.post('/api/users', json={'username': 'ann', 'email': ' Ann@Example.COM '})
+    assert created.status_code == 201
+    assert created.get_json()['email'] == 'ann@example.com'
+
+    user_id = created.get_json()['id']
+    updated = user_client.put(f'/api/users/{user_id}', json={'email': 'ANN@example.org'})
+    assert updated.get_json()['email'] == 'ann@example.org'
+
+
+def test_bulk_json_array_reports_bad_rows(user_client):
+    user_client.post('/api/users', json={'username': 'taken', 'email': 'taken@example.com'})
+
+    response = user_client.post('/api/users/bulk', json=[
+        {'username': 'ann', 'email': 'Ann@Example.com'},
+        {'username': 'bob'},
+        'not an object',
+        {'username': 'ann', 'email': 'other@example.com'},
+        {'username': 'cat', 'email': 'ANN@example.com'},
+        {'username': 'taken', 'email': 'new@example.com'},
+        {'username': 'dan', 'email': 'taken@example.com'},
+        {'username': 'eve', 'email': 'eve@example.com'}
+    ])
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['inserted'] == 2
+    assert result['updated'] == 0
+    assert {error['row']: error['error'] for error in result['errors']} == {
+        1: 'A valid email is required',
+        2: 'Row must be a JSON object',
+        3: 'Duplicate username in payload',
+        4: 'Duplicate email in payload',
+        5: 'Username already exists',
+        6: 'Email already in use'
+    }
+
+    users = {user['username']: user['email'] for user in user_client.get('/api/users').get_json()}
+    assert users == {'taken': 'taken@example.com', 'ann': 'ann@example.com', 'eve': 'eve@example.com'}
+
+
+def test_bulk_rejects_non_array_json(user_client):
+    response = user_client.post('/api/users/bulk', json={'username': 'ann'})
+    assert response.status_code == 400
+
+
+def test_bulk_ndjson_stream(user_client):
+    response = post_ndjson(user_client, [
+        {'username': 'ann', 'email': 'ann@example.com'},
+        '{not json',
+        '',
+        {'username': 'bob', 'email': 'bob@example.com'}
+    ])
+    result = response.get_json()
+    assert result['inserted'] == 2
+    assert result['errors'] == [{'row': 1, 'error': 'Row must be a JSON object'}]
+
+
+def test_bulk_upsert_updates_existing_usernames(user_client):
+    post_ndjson(user_client, [{'username': 'ann', 'email': 'ann@example.com'}])
+
+    rejected = post_ndjson(user_client, [{'username': 'ann', 'email': 'ann@new.example.com'}]).get_json()
+    assert rejected['updated'] == 0
+    assert rejected['errors'] == [{'row': 0, 'error': 'Username already exists'}]
+
+    result = post_ndjson(user_client, [
+        {'username': 'ann', 'email': 'Ann@New.example.com'},
+        {'username': 'bob', 'email': 'bob@example.com'}
+    ], mode='upsert').get_json()
+    assert (result['inserted'], result['updated'], result['errors']) == (1, 1, [])
+
+    ann = user_client.get('/api/users/by-username/ann').get_json()
+    assert ann['email'] == 'ann@new.example.com'
+
+
+def test_bulk_rejects_unknown_mode(user_client):
+    assert user_client.post('/api/users/bulk?mode=merge', json=[]).status_code == 400
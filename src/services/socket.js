@@ -150,6 +150,16 @@ class SocketService {
       console.log(`🏓 Pong - Latency: ${latency}ms`)
     })
 
+    // Server-side RTT measurement; ack immediately so the server can time it
+    this.socket.on('rtt_probe', (payload, ack) => {
+      if (typeof ack === 'function') ack(payload)
+    })
+
+    // Payloads the server rejected before handling them
+    this.socket.on('payload_error', (error) => {
+      console.error(`🚫 Server rejected ${error?.event}: ${error?.message}`)
+    })
+
     // Re-register all existing listeners
     this.listeners.forEach((callback, event) => {
       this.socket.on(event, callback)
@@ -247,10 +257,11 @@ class SocketService {
     })
   }
 
-  joinRoom(roomCode, playerName) {
+  joinRoom(roomCode, playerName, hostToken) {
     this.emit('join_room', { 
       room_code: roomCode, 
-      player_name: playerName 
+      player_name: playerName,
+      ...(hostToken && { host_token: hostToken })
     }, (response) => {
       if (response?.error) {
         console.error('Join room error:', response.error)